@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .list_cache import bump_generation
+from .models import ArchivedJob, Job, JobActivity, JobDailyStats
+
+
+def expired_jobs(now=None):
+    """
+    Ingested postings older than JOB_EXPIRY_DAYS that nobody is working on
+
+    Age is the posting's own date (epoch). Sources skip records at or below
+    their watermark before any write, so a dated posting is never refreshed
+    and updated_at says nothing about whether its feed still lists it.
+    Records without a date bypass the watermark and are upserted on every
+    fetch, so for those updated_at is the last time the feed listed them.
+    Jobs posted on the platform (no fingerprint) and jobs with funds locked
+    on chain are never archived.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=settings.JOB_EXPIRY_DAYS)
+    return (
+        Job.objects.filter(fingerprint__isnull=False)
+        .filter(Q(epoch__lt=int(cutoff.timestamp())) | Q(epoch__isnull=True, updated_at__lt=cutoff))
+        .filter(lock_amount=0)
+        .filter(Q(walrus_lock_id__isnull=True) | Q(walrus_lock_id=''))
+        .exclude(status='in_progress')
+    )
+
+
+def _reattach(model, job_ids):
+    """Point a batch's rows of ``model`` at their archived jobs before the jobs are deleted"""
+    archived_id = ArchivedJob.objects.filter(original_id=OuterRef('job_id')).values('id')[:1]
+    model.objects.filter(job_id__in=job_ids).update(archived_job_id=Subquery(archived_id))
+
+
+def archive_expired_jobs(batch_size=None, now=None):
+    """
+    Move expired jobs from the Job table into ArchivedJob.
+
+    Jobs are walked in id order with keyset pagination (``id > last seen``)
+    rather than OFFSET, so every batch costs the same however far along the
+    run is. Each batch is copied and deleted in its own transaction; open
+    jobs are archived as closed. Users'
+    activity and the daily stats move to the archived job; skills, LSH
+    buckets and recommendations (rebuilt by the recommender) are deleted,
+    and any near-duplicates of an archived job become canonical again.
+
+    Returns:
+        int: Number of jobs archived
+    """
+    batch_size = batch_size or settings.JOB_ARCHIVE_BATCH_SIZE
+    jobs = expired_jobs(now).order_by('id').only('id', *ArchivedJob.COPIED_FIELDS)
+    archived_count = 0
+    last_id = 0
+    while True:
+        batch = list(jobs.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1].id
+        with transaction.atomic():
+            # Overlapping runs may pick the same rows; original_id keeps the archive unique
+            ArchivedJob.objects.bulk_create(
+                [ArchivedJob.from_job(job) for job in batch], ignore_conflicts=True
+            )
+            job_ids = [job.id for job in batch]
+            _reattach(JobActivity, job_ids)
+            _reattach(JobDailyStats, job_ids)
+            Job.objects.filter(id__in=job_ids).delete()
+        archived_count += len(batch)
+    if archived_count:
+        bump_generation()
+    return archived_count
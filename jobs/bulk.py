@@ -0,0 +1,57 @@
+"""
+Bulk job creation for organizations.
+
+Postings arrive already validated. Their slugs are allocated together with
+one query, they are inserted with a single ``bulk_create``, and they are
+clustered and skill-matched as a batch, all in one transaction, the way
+ingest stores external postings (see jobs.job_fetcher).
+"""
+import logging
+
+from django.db import IntegrityError, transaction
+
+from .list_cache import bump_generation
+from .models import Job
+from .services.near_duplicates import NearDuplicateIndex
+from .services.skill_matcher import SkillMatcher
+from .slugs import SlugAllocator
+
+logger = logging.getLogger(__name__)
+
+
+def _allocate_slugs(jobs):
+    for job, slug in zip(jobs, SlugAllocator().allocate([job.title for job in jobs])):
+        job.slug = slug
+
+
+def create_jobs(jobs):
+    """
+    Insert unsaved jobs in one transaction
+
+    Args:
+        jobs (list): Unsaved Job instances, their created_by already set
+
+    Returns:
+        list: The same jobs, saved
+    """
+    if not jobs:
+        return []
+    for job in jobs:
+        # bulk_create skips Job.save()
+        job.set_description_text()
+    _allocate_slugs(jobs)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs)
+        except IntegrityError as e:
+            # A slug was taken concurrently by another writer; reallocate and retry once
+            logger.info(f"Bulk job insert failed, retrying with fresh slugs: {e}")
+            _allocate_slugs(jobs)
+            Job.objects.bulk_create(jobs)
+        NearDuplicateIndex().index_jobs(jobs)
+        SkillMatcher().assign_skills(jobs)
+
+    bump_generation()
+    return jobs
@@ -0,0 +1,154 @@
+"""
+Per-user recommendation feeds in Redis sorted sets.
+
+``recommendations:user:<id>`` holds every job recommended for any of a
+user's CVs, scored by its best match_score. The feed mirrors the
+JobRecommendation rows: it is rewritten from them whenever the recommender
+changes a user's rows, and rebuilt on read when it is missing (evicted by
+its TTL or lost with Redis). Reading a page is one ZREVRANGE plus one
+in_bulk() query, however many CVs and recommendations the user has.
+Async views use the ``a``-prefixed methods, which talk to Redis without
+holding a thread.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+from redis.exceptions import RedisError
+
+from skillsverse_backend.walrus_db import db, get_async_db
+from .models import Job, JobRecommendation
+
+logger = logging.getLogger(__name__)
+
+USER_FEED_KEY = 'recommendations:user:{}'
+
+
+def refresh_user_feeds(user_ids):
+    """Rewrite the feeds of these users from their JobRecommendation rows"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    feeds = {user_id: {} for user_id in user_ids}
+    rows = (
+        JobRecommendation.objects.filter(cv__created_by_id__in=user_ids)
+        .values_list('cv__created_by_id', 'job_id')
+        .annotate(score=Max('match_score'))
+        .order_by()
+    )
+    for user_id, job_id, score in rows:
+        feeds[user_id][job_id] = score
+
+    try:
+        # MULTI/EXEC, so a reader never sees a feed between DEL and ZADD
+        with db.pipeline(transaction=True) as pipe:
+            for user_id, scores in feeds.items():
+                key = USER_FEED_KEY.format(user_id)
+                pipe.delete(key)
+                if scores:
+                    pipe.zadd(key, scores)
+                    pipe.expire(key, settings.RECOMMENDATION_FEED_TTL)
+            pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Could not publish recommendation feeds: {e}")
+
+
+class RecommendationFeed:
+    """
+    A user's recommended jobs, best match first, sliceable like a QuerySet for pagination.
+
+    Each job in a page carries its score as ``match_score``. Jobs that were
+    archived or deleted since the feed was written are dropped from the page
+    and from the feed.
+    """
+    ordered = True
+
+    def __init__(self, user_id, queryset=None):
+        self.key = USER_FEED_KEY.format(user_id)
+        self.queryset = Job.objects.all() if queryset is None else queryset
+
+    @classmethod
+    def for_user(cls, user_id, queryset=None):
+        """The user's feed, rebuilt first if Redis no longer has it; raises RedisError when Redis is down"""
+        if not db.exists(USER_FEED_KEY.format(user_id)):
+            refresh_user_feeds([user_id])
+        return cls(user_id, queryset)
+
+    @classmethod
+    async def afor_user(cls, user_id, queryset=None):
+        """Async variant of for_user"""
+        if not await get_async_db().exists(USER_FEED_KEY.format(user_id)):
+            await sync_to_async(refresh_user_feeds)([user_id])
+        return cls(user_id, queryset)
+
+    def count(self):
+        return db.zcard(self.key)
+
+    async def acount(self):
+        return await get_async_db().zcard(self.key)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start, stop = self._range(key.start, key.stop)
+        if stop is None:
+            return []
+        entries = self._entries(db.zrevrange(self.key, start, stop, withscores=True))
+        page, gone = self._hydrate(entries, self.queryset.in_bulk([job_id for job_id, _ in entries]))
+        if gone:
+            db.zrem(self.key, *gone)
+        return page
+
+    async def apage(self, start, stop):
+        """Async ``feed[start:stop]``"""
+        client = get_async_db()
+        start, stop = self._range(start, stop)
+        if stop is None:
+            return []
+        entries = self._entries(await client.zrevrange(self.key, start, stop, withscores=True))
+        page, gone = self._hydrate(entries, await self.queryset.ain_bulk([job_id for job_id, _ in entries]))
+        if gone:
+            await client.zrem(self.key, *gone)
+        return page
+
+    @staticmethod
+    def _range(start, stop):
+        """ZREVRANGE bounds of a slice; stop is None for an empty slice"""
+        start = start or 0
+        if stop is None:
+            return start, -1
+        if stop <= start:
+            return start, None
+        return start, stop - 1
+
+    @staticmethod
+    def _entries(members):
+        return [(int(member), score) for member, score in members]
+
+    @staticmethod
+    def _hydrate(entries, jobs):
+        """Jobs of a page in feed order, and the ids that are no longer in the Job table"""
+        page = []
+        gone = []
+        for job_id, score in entries:
+            job = jobs.get(job_id)
+            if job is None:
+                gone.append(job_id)
+                continue
+            job.match_score = score
+            page.append(job)
+        return page, gone
+
+
+def recommendations_from_database(user_id, queryset=None):
+    """The same feed as RecommendationFeed, computed with a join; used when Redis is unavailable"""
+    queryset = Job.objects.all() if queryset is None else queryset
+    return (
+        queryset.filter(jobrecommendation__cv__created_by_id=user_id)
+        .annotate(match_score=Max('jobrecommendation__match_score'))
+        .order_by('-match_score', '-id')
+    )
@@ -0,0 +1,38 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r"^(utm_.*|ref|source|fbclid|gclid)$", re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Canonical form of a posting URL: lowercase host, no www, tracking params, fragment or trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit(("https", host, parts.path.rstrip("/"), query, ""))
+
+
+def normalize_text(value):
+    return " ".join((value or "").split()).casefold()
+
+
+def job_fingerprint(external_link, title, company_name):
+    """
+    Stable identity of an external posting.
+
+    The posting URL identifies a job on its board even when its title or
+    description is edited; postings without a URL fall back to title and
+    company.
+    """
+    if external_link:
+        key = "url:" + normalize_url(external_link)
+    else:
+        key = "job:" + normalize_text(title) + "|" + normalize_text(company_name)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
@@ -1,8 +1,17 @@
+import ijson
 import requests
-from django.db import IntegrityError
-from django.utils.text import slugify
-from django.utils.crypto import get_random_string
-from .models import Job
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from .models import Job, JobSourceState
+from .job_sources import get_http_session, get_sources
+from .slugs import SlugAllocator
+from .list_cache import bump_generation
+from .fingerprints import job_fingerprint
+from .services.near_duplicates import NearDuplicateIndex
+from .services.skill_matcher import SkillMatcher
 from datetime import datetime
 from django.contrib.auth import get_user_model
 
@@ -24,58 +33,79 @@ def get_or_create_system_user():
     return user
 
 
-def fetch_external_jobs():
-    external_apis = [
-        "https://remoteok.io/api",
-        "https://www.arbeitnow.com/api/job-board-api",
-    ]
+def ingest_source(source, session, created_by, slug_allocator, skill_matcher=None, batch_size=None):
+    """
+    Stream one source into the database in fixed-size batches.
+
+    Records are mapped, deduplicated and committed one batch at a time, so
+    memory use stays flat no matter how large the feed is. The source's
+    watermark is only saved once its whole feed has been stored.
+    """
+    batch_size = batch_size or settings.JOB_INGEST_BATCH_SIZE
+    records = source.iter_records(session)
+    saved_count = 0
+    try:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            saved_count += save_jobs_to_db(batch, created_by, slug_allocator, skill_matcher)
+        save_source_states([source])
+    except requests.RequestException as e:
+        print(f"Failed to fetch jobs from {source.url}: {e}")
+    except (ValueError, ijson.JSONError) as e:
+        print(f"Failed to parse JSON from {source.url}: {e}")
+    return saved_count
 
-    all_jobs = []
-    for api_url in external_apis:
-        try:
-            response = requests.get(api_url, timeout=10)
-            response.raise_for_status()
 
-            data = response.json()
+def _ingest_source_in_thread(*args):
+    try:
+        return ingest_source(*args)
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        connection.close()
 
-            # Handle different API response structures
-            if api_url == "https://remoteok.io/api" and isinstance(data, list) and len(data) > 0:
-                # RemoteOK API sometimes has a meta object at index 0
-                if isinstance(data[0], dict) and data[0].get("0", "") == "API Documentation":
-                    data = data[1:]  # Skip the first meta object
-                all_jobs.extend(data)
-            elif api_url == "https://www.arbeitnow.com/api/job-board-api" and isinstance(data, dict):
-                if "data" in data and isinstance(data["data"], list):
-                    all_jobs.extend(data["data"])
-                elif "jobs" in data and isinstance(data["jobs"], list):
-                    all_jobs.extend(data["jobs"])
 
-        except requests.RequestException as e:
-            print(f"Failed to fetch jobs from {api_url}: {e}")
-        except ValueError as e:
-            print(f"Failed to parse JSON from {api_url}: {e}")
+def ingest_external_jobs(sources):
+    """
+    Ingest every source concurrently.
 
-    return all_jobs
+    Each source runs in its own thread over the shared pooled session, so the
+    total wall-clock time is that of the slowest source rather than the sum.
+    """
+    if not sources:
+        return 0
+
+    session = get_http_session()
+    # Resolved once per run and shared by every source and batch
+    created_by = get_or_create_system_user()
+    slug_allocator = SlugAllocator()
+    skill_matcher = SkillMatcher()
+    saved_count = 0
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = [
+            executor.submit(
+                _ingest_source_in_thread, source, session, created_by, slug_allocator, skill_matcher
+            )
+            for source in sources
+        ]
+        for future in as_completed(futures):
+            saved_count += future.result()
+    return saved_count
 
 
 def generate_unique_slug(title):
     """Generate a unique slug from the job title."""
-    if not title or title == "Untitled":
-        title = "job-posting-" + get_random_string(8)
-    
-    base_slug = slugify(title)
-    unique_slug = base_slug
-    
-    counter = 1
-    while Job.objects.filter(slug=unique_slug).exists():
-        unique_slug = f"{base_slug}-{counter}"
-        counter += 1
-        
-    return unique_slug
+    return SlugAllocator().allocate([title])[0]
 
 
-def map_job_data(job):
-    """Map external API fields to the Job model accounting for different API formats."""
+def map_job_data(job, created_by=None, slug=None):
+    """
+    Map external API fields to the Job model accounting for different API formats.
+    
+    Bulk callers pass the system user and a pre-allocated slug (or "" to
+    assign one later) so that mapping a record costs no queries.
+    """
     # Handle different APIs with various field names
     title = job.get("title", job.get("position", job.get("name", "Untitled")))
     company = job.get("company", job.get("company_name", "Unknown"))
@@ -92,86 +122,137 @@ def map_job_data(job):
     elif isinstance(job.get("tags"), str):
         tags = [tag.strip() for tag in job.get("tags").split(",")]
     
-    return Job(
+    mapped_job = Job(
+        fingerprint=job_fingerprint(url, title, company),
         title=title,
         description=description,
         company_name=company,
         location=location,
         external_link=url,
         company_logo=job.get("company_logo", job.get("logo", "")),
-        slug=generate_unique_slug(title),
+        slug=generate_unique_slug(title) if slug is None else slug,
         tags=tags,
+        salary_min=job.get("salary_min"),
+        salary_max=job.get("salary_max"),
         responsibilities=job.get("responsibilities", []),
         qualifications=job.get("qualifications", []),
         employment_type=job.get("employment_type", job.get("job_type", "Full-time")),
         source=job.get("source", "external"),
         epoch=job.get("epoch", int(datetime.now().timestamp())),
-        created_by=get_or_create_system_user(),
+        created_by=created_by or get_or_create_system_user(),
         lock_amount=0.00,
         status="open",
     )
+    # bulk_create skips Job.save(), so derive the plain text here
+    mapped_job.set_description_text()
+    return mapped_job
+
+
+# Fields of an already-stored posting that are refreshed from its feed
+REFRESHED_FIELDS = [
+    "title", "description", "description_text", "summary", "company_name",
+    "location", "external_link", "company_logo", "tags", "salary_min",
+    "salary_max", "employment_type", "epoch", "updated_at",
+]
 
 
-def save_jobs_to_db(job_list):
-    """Save jobs in bulk, avoiding duplicates."""
-    # Ensure all jobs are valid dictionaries
-    job_list = [job for job in job_list if isinstance(job, dict)]
+def _upsert_jobs(jobs):
+    """Insert new postings and refresh known ones, letting the fingerprint index decide which is which."""
+    with transaction.atomic():
+        return Job.objects.bulk_create(
+            jobs,
+            update_conflicts=True,
+            unique_fields=["fingerprint"],
+            update_fields=REFRESHED_FIELDS,
+        )
+
+
+def save_jobs_to_db(job_list, created_by=None, slug_allocator=None, skill_matcher=None):
+    """
+    Save one batch of jobs in bulk.
     
-    # Fetch existing job URLs and titles to check for duplicates
-    existing_job_urls = set(Job.objects.values_list("external_link", flat=True))
-    existing_job_titles_and_companies = set(
-        Job.objects.values_list("title", "company_name")
-    )
+    Duplicates are detected by the unique fingerprint index rather than in
+    Python: postings seen before have their mutable fields refreshed, new
+    ones are inserted. Returns the number of new jobs.
+    """
+    created_by = created_by or get_or_create_system_user()
+    slug_allocator = slug_allocator or SlugAllocator()
+    skill_matcher = skill_matcher or SkillMatcher()
     
-    new_jobs = []
+    # Ensure all jobs are valid dictionaries with a title
+    job_list = [
+        job for job in job_list
+        if isinstance(job, dict) and (job.get("title") or job.get("position") or job.get("name"))
+    ]
+    # A posting repeated within the batch is stored once (last copy wins);
+    # the database would reject updating the same row twice in one statement
+    jobs_by_fingerprint = {}
     for job in job_list:
-        # Skip jobs with empty titles
-        if not job.get("title") and not job.get("position") and not job.get("name"):
-            continue
-            
-        mapped_job = map_job_data(job)
-        
-        # Check if job already exists by URL or title+company combination
-        url_exists = mapped_job.external_link and mapped_job.external_link in existing_job_urls
-        title_company_exists = (mapped_job.title, mapped_job.company_name) in existing_job_titles_and_companies
-        
-        if not url_exists and not title_company_exists:
-            new_jobs.append(mapped_job)
-            # Update our sets to avoid duplicates within this batch
-            if mapped_job.external_link:
-                existing_job_urls.add(mapped_job.external_link)
-            existing_job_titles_and_companies.add((mapped_job.title, mapped_job.company_name))
-    
-    saved_count = 0
-    if new_jobs:
-        try:
-            Job.objects.bulk_create(new_jobs)
-            saved_count = len(new_jobs)
-            print(f"Successfully saved {saved_count} new jobs.")
-        except IntegrityError as e:
-            # Fall back to individual creation if bulk fails
-            print(f"Bulk create failed, trying individual creation: {e}")
-            saved_count = 0
-            for job in new_jobs:
-                try:
-                    job.save()
-                    saved_count += 1
-                except IntegrityError:
-                    pass
-            print(f"Successfully saved {saved_count} new jobs individually.")
-    else:
+        mapped_job = map_job_data(job, created_by=created_by, slug="")
+        jobs_by_fingerprint[mapped_job.fingerprint] = mapped_job
+    jobs = list(jobs_by_fingerprint.values())
+    if not jobs:
         print("No new jobs to save.")
+        return 0
+    
+    known_count = Job.objects.filter(fingerprint__in=jobs_by_fingerprint).count()
+    
+    # Slugs only stick for inserted rows; refreshed rows keep their own
+    for job, slug in zip(jobs, slug_allocator.allocate([job.title for job in jobs])):
+        job.slug = slug
+    
+    try:
+        _upsert_jobs(jobs)
+    except IntegrityError as e:
+        # A slug was taken concurrently by another writer; reallocate against the table and retry once
+        print(f"Bulk upsert failed, retrying with fresh slugs: {e}")
+        for job, slug in zip(jobs, SlugAllocator().allocate([job.title for job in jobs])):
+            job.slug = slug
+        _upsert_jobs(jobs)
     
+    # The same posting cross-listed on another board has a different URL, so
+    # it gets its own row; cluster it under the first copy we stored
+    duplicate_count = NearDuplicateIndex().index_jobs(jobs)
+    # Skills are matched once here rather than every time a job is read
+    skill_matcher.assign_skills(jobs)
+    bump_generation()
+    
+    saved_count = len(jobs) - known_count
+    print(f"Successfully saved {saved_count} new jobs and refreshed {known_count} existing ones "
+          f"({duplicate_count} near-duplicates).")
     return saved_count
 
 
+def load_sources():
+    """Instantiate the registered sources with the state saved by earlier runs."""
+    states = {state.source: state for state in JobSourceState.objects.all()}
+    return get_sources(states)
+
+
+def save_source_states(sources):
+    """Remember validators and watermarks of the sources that were fetched successfully."""
+    now = timezone.now()
+    for source in sources:
+        if not source.fetched:
+            continue
+        JobSourceState.objects.update_or_create(
+            source=source.name,
+            defaults={
+                "etag": source.etag,
+                "last_modified": source.last_modified,
+                "max_epoch": source.max_epoch,
+                "last_fetched_at": now,
+            },
+        )
+
+
 def fetch_jobs_task():
     """Task to fetch and store jobs from external APIs."""
-    jobs = fetch_external_jobs()
+    sources = load_sources()
+    saved_count = ingest_external_jobs(sources)
 
-    if not jobs:
-        print("No jobs fetched from external APIs.")
+    if not saved_count:
+        print("No new jobs fetched from external APIs.")
         return "No jobs fetched."
 
-    saved_count = save_jobs_to_db(jobs)
-    return f"Successfully saved {saved_count} new jobs."
\ No newline at end of file
+    return f"Successfully saved {saved_count} new jobs."
@@ -0,0 +1,257 @@
+import threading
+from datetime import datetime
+
+import ijson
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# name -> JobSource subclass, filled in by @register_source
+SOURCE_REGISTRY = {}
+
+POOL_SIZE = 10
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def register_source(cls):
+    """Class decorator that makes a job source available to the fetcher"""
+    SOURCE_REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_sources(states=None, urls=None):
+    """
+    Instantiate every registered source
+
+    Args:
+        states (dict): Optional {source name: JobSourceState} from earlier runs
+        urls (dict): Optional {source name: feed URL} overriding the configured ones
+    """
+    states = states or {}
+    urls = urls or {}
+    return [
+        source_class(states.get(name), urls.get(name))
+        for name, source_class in SOURCE_REGISTRY.items()
+    ]
+
+
+def get_http_session():
+    """
+    Shared HTTP session for all sources.
+
+    Connections are pooled per host and kept alive between pages and runs,
+    and transient failures (connection errors, 429 and 5xx responses) are
+    retried with backoff before a source gives up.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = "SkillsVerse job fetcher"
+            _session = session
+        return _session
+
+
+class _StreamedPage:
+    """
+    Incremental parser for one page of a feed.
+
+    Iterating yields each record found under ``item_prefixes`` as soon as it
+    has been read; the next page URL, if any, is available afterwards as
+    ``next_url``.
+    """
+
+    def __init__(self, stream, item_prefixes, next_page_prefix=None):
+        self.stream = stream
+        self.item_prefixes = item_prefixes
+        self.next_page_prefix = next_page_prefix
+        self.next_url = None
+
+    def __iter__(self):
+        builder = None
+        for prefix, event, value in ijson.parse(self.stream, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix in self.item_prefixes and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix in self.item_prefixes and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == self.next_page_prefix and event == "string":
+                self.next_url = value
+
+
+class JobSource:
+    """
+    Base class for an external job board.
+
+    A source knows where its feed lives, how to walk its pages and how to
+    turn one of its records into the common dict understood by
+    ``map_job_data``.
+
+    Fetching is incremental: the first page is requested with the validators
+    saved from the previous run, and records no newer than the saved
+    watermark are dropped before they are mapped.
+    """
+    name = None     # Registry key
+    label = None    # Stored in Job.source
+    url = None      # Default feed URL, overridable through settings.JOB_SOURCE_URLS
+    timeout = 10    # Seconds per request
+    max_pages = 1
+    newest_first = False        # Whether pages are ordered by descending epoch
+    item_prefixes = ("item",)   # ijson prefixes of the job records in a page
+    next_page_prefix = None     # ijson prefix of the next page URL, if paginated
+
+    def __init__(self, state=None, url=None):
+        self.url = url or getattr(settings, "JOB_SOURCE_URLS", {}).get(self.name) or self.url
+        # JobSourceState from the previous run, if any
+        self.state = state
+        self.watermark = state.max_epoch if state else None
+        # Values to save once this run's jobs are stored
+        self.etag = state.etag if state else None
+        self.last_modified = state.last_modified if state else None
+        self.max_epoch = self.watermark
+        self.fetched = False
+
+    def iter_records(self, session):
+        """
+        Stream the new part of the feed, yielding records mapped to the common format
+
+        Pages are parsed incrementally straight off the socket, so only the
+        record being yielded is held in memory, however large the feed is.
+        """
+        url = self.url
+        pages = 0
+        while url and pages < self.max_pages:
+            headers = self._conditional_headers() if pages == 0 else {}
+            response = session.get(url, timeout=self.timeout, headers=headers, stream=True)
+            try:
+                if response.status_code == 304:
+                    break
+                response.raise_for_status()
+                if pages == 0:
+                    self.etag = response.headers.get("ETag")
+                    self.last_modified = response.headers.get("Last-Modified")
+
+                response.raw.decode_content = True
+                page = _StreamedPage(response.raw, self.item_prefixes, self.next_page_prefix)
+                new_on_page = 0
+                for record in page:
+                    if not self.keep_record(record) or not self._is_new(record):
+                        continue
+                    new_on_page += 1
+                    yield self.map_record(record)
+            finally:
+                response.close()
+
+            # On a newest-first feed, a page with nothing new means the
+            # remaining pages hold nothing new either
+            if self.newest_first and self.watermark is not None and not new_on_page:
+                break
+            url = page.next_url
+            pages += 1
+        self.fetched = True
+
+    def _conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def _is_new(self, record):
+        epoch = self.record_epoch(record)
+        if epoch is None:
+            return True
+        if self.watermark is not None and epoch <= self.watermark:
+            return False
+        if self.max_epoch is None or epoch > self.max_epoch:
+            self.max_epoch = epoch
+        return True
+
+    def keep_record(self, record):
+        """Whether a raw record is a job posting (feeds may mix in metadata)"""
+        return isinstance(record, dict)
+
+    def record_epoch(self, record):
+        """Posting time of a raw record as a Unix timestamp, or None if unknown"""
+        return None
+
+    def map_record(self, record):
+        """Map a raw record to the common job dict"""
+        raise NotImplementedError
+
+
+@register_source
+class RemoteOKSource(JobSource):
+    name = "remoteok"
+    label = "RemoteOK"
+    url = "https://remoteok.io/api"
+    newest_first = True
+
+    def keep_record(self, record):
+        # RemoteOK API has a meta object (legal notice, no position) at index 0
+        return isinstance(record, dict) and ("position" in record or "title" in record)
+
+    def record_epoch(self, record):
+        epoch = record.get("epoch")
+        return int(epoch) if epoch else None
+
+    def map_record(self, record):
+        return {
+            "title": record.get("position", record.get("title")),
+            "company": record.get("company") or "Unknown",
+            "description": record.get("description", ""),
+            "location": record.get("location") or "Remote",
+            "url": record.get("apply_url") or record.get("url", ""),
+            "company_logo": record.get("company_logo") or record.get("logo", ""),
+            "tags": record.get("tags") or [],
+            "salary_min": record.get("salary_min") or None,
+            "salary_max": record.get("salary_max") or None,
+            "source": self.label,
+            "epoch": record.get("epoch"),
+        }
+
+
+@register_source
+class ArbeitnowSource(JobSource):
+    name = "arbeitnow"
+    label = "Arbeitnow"
+    url = "https://www.arbeitnow.com/api/job-board-api"
+    max_pages = 5
+    newest_first = True
+    item_prefixes = ("data.item", "jobs.item")
+    next_page_prefix = "links.next"
+
+    def record_epoch(self, record):
+        created_at = record.get("created_at")
+        return int(created_at) if created_at else None
+
+    def map_record(self, record):
+        job_types = record.get("job_types") or []
+        return {
+            "title": record.get("title"),
+            "company": record.get("company_name") or "Unknown",
+            "description": record.get("description", ""),
+            "location": "Remote" if record.get("remote") else record.get("location") or "Remote",
+            "url": record.get("url", ""),
+            "tags": record.get("tags") or [],
+            "employment_type": job_types[0] if job_types else "Full-time",
+            "source": self.label,
+            "epoch": record.get("created_at") or int(datetime.now().timestamp()),
+        }
@@ -0,0 +1,101 @@
+"""
+Response cache for the public job list.
+
+Rendered pages are stored in Redis under the current list *generation*.
+Anything that changes what the list shows bumps the generation, which
+orphans every cached page at once (they expire on their own) instead of
+deleting keys one by one. The generation and the query parameters also
+make up the ETag, so a client revalidating an unchanged page gets a 304
+without the page being rebuilt.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse
+from redis.exceptions import RedisError
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from skillsverse_backend.walrus_db import db
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'jobs:list:generation'
+PAGE_KEY = 'jobs:list:{generation}:{view}:{params}'
+
+
+def current_generation():
+    """Current list generation, or None when Redis is unavailable"""
+    try:
+        return int(db.get(GENERATION_KEY) or 0)
+    except RedisError as e:
+        logger.warning(f"Job list cache unavailable: {e}")
+        return None
+
+
+def bump_generation():
+    """Invalidate every cached job list page"""
+    try:
+        db.incr(GENERATION_KEY)
+    except RedisError as e:
+        # Cached pages still expire after JOB_LIST_CACHE_TTL
+        logger.warning(f"Could not invalidate the job list cache: {e}")
+
+
+def _params_hash(request):
+    params = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    # Pagination links in the body are absolute, so the host is part of the key
+    key = f"{request.scheme}://{request.get_host()}|{params!r}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    candidates = {candidate.strip().removeprefix('W/') for candidate in header.split(',')}
+    return etag in candidates or '*' in candidates
+
+
+class CachedListMixin:
+    """
+    Serves ``list`` from the generation-keyed response cache.
+
+    Only for views whose response depends on nothing but the query string.
+    Non-JSON renderers (the browsable API) and Redis outages bypass the cache.
+    """
+    cache_name = None  # Distinguishes the views sharing the cache
+
+    def list(self, request, *args, **kwargs):
+        generation = current_generation()
+        if generation is None or request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        params = _params_hash(request)
+        etag = f'"{generation}-{params[:20]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _etag_matches(request, etag):
+            return Response(status=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = PAGE_KEY.format(generation=generation, view=self.cache_name or type(self).__name__, params=params)
+        try:
+            content = db.get(key)
+        except RedisError as e:
+            logger.warning(f"Job list cache unavailable: {e}")
+            content = None
+        if content is not None:
+            return HttpResponse(content, content_type=request.accepted_renderer.media_type, headers=headers)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == HTTP_200_OK:
+            # Render now (finalize_response would do the same) to keep the bytes
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+            try:
+                db.set(key, response.content, ex=settings.JOB_LIST_CACHE_TTL)
+            except RedisError as e:
+                logger.warning(f"Could not cache job list page: {e}")
+            for header, value in headers.items():
+                response[header] = value
+        return response
@@ -0,0 +1,89 @@
+import threading
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from jobs.job_fetcher import ingest_external_jobs
+from jobs.job_sources import get_sources
+from jobs.models import Job, JobSourceState
+
+from .mock_job_board import add_board_arguments, board_from_options
+
+
+class QueryCounter:
+    """Execute wrapper counting queries on every connection it is installed on, across threads"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the full fetch, map, dedupe and save path against a local mock board "
+        "and report jobs/sec, queries per job and peak memory"
+    )
+
+    def add_arguments(self, parser):
+        add_board_arguments(parser)
+        parser.add_argument('--runs', type=int, default=1, help="Ingest runs; later runs exercise the refresh path")
+        parser.add_argument('--keep', action='store_true', help="Keep the ingested jobs instead of deleting them")
+
+    def handle(self, *args, **options):
+        # Ingest saves validators and watermarks per source; put the real ones back afterwards
+        saved_states = list(JobSourceState.objects.all())
+
+        counter = QueryCounter()
+        # Ingest threads open their own connections
+        connection_created.connect(counter.install)
+        counter.install(connection=connection)
+        board = board_from_options(options).start()
+        try:
+            self.stdout.write(f"Mock board on {board.base_url}")
+            for run in range(1, options['runs'] + 1):
+                self._run(run, board, counter)
+        finally:
+            board.stop()
+            connection_created.disconnect(counter.install)
+            if counter in connection.execute_wrappers:
+                connection.execute_wrappers.remove(counter)
+            if not options['keep']:
+                deleted, _ = Job.objects.filter(external_link__startswith=board.base_url).delete()
+                self.stdout.write(f"Deleted {deleted} benchmark rows")
+            JobSourceState.objects.all().delete()
+            JobSourceState.objects.bulk_create(saved_states)
+
+    def _run(self, run, board, counter):
+        # Always fetch the full feeds: no validators or watermarks from earlier runs
+        sources = get_sources(urls=board.urls)
+        requests_before, errors_before = board.requests, board.errors
+        queries_before = counter.count
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        saved = ingest_external_jobs(sources)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        queries = counter.count - queries_before
+        processed = Job.objects.filter(external_link__startswith=board.base_url).count()
+        self.stdout.write(
+            f"Run {run}: {processed} jobs ({saved} new) in {elapsed:.2f}s, "
+            f"{processed / elapsed if elapsed else 0:.0f} jobs/sec, "
+            f"{queries} queries ({queries / processed if processed else 0:.2f}/job), "
+            f"peak memory {peak / (1024 * 1024):.1f}MB, "
+            f"{board.requests - requests_before} requests ({board.errors - errors_before} failed)"
+        )
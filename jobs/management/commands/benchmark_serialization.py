@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from jobs.models import Job
+from jobs.serializers import JobListSerializer, JobSerializer
+from jobs.views import narrow_to_fields
+from skillsverse_backend.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare payload bytes and serialization time of one job list page across list representations"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20, help="Timed repetitions per variant")
+        parser.add_argument(
+            '--fields', default='id,title,summary,company_name,location,slug',
+            help="?fields= projection for the sparse variant",
+        )
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        if not Job.objects.exists():
+            raise CommandError("No jobs to serialize; ingest some first.")
+
+        factory = APIRequestFactory()
+        full_request = Request(factory.get('/'))
+        sparse_request = Request(factory.get('/', {'fields': options['fields']}))
+        base = Job.objects.filter(canonical__isnull=True).order_by('-created_at')
+
+        variants = [
+            # Before: full serializer over whole rows, stdlib JSON
+            ("full + json", base.select_related('created_by').prefetch_related('skills'),
+             JobSerializer, full_request, JSONRenderer()),
+            ("list + json", narrow_to_fields(base, full_request), JobListSerializer, full_request, JSONRenderer()),
+            ("list + orjson", narrow_to_fields(base, full_request), JobListSerializer, full_request, ORJSONRenderer()),
+            ("sparse + orjson", narrow_to_fields(base, sparse_request), JobListSerializer, sparse_request,
+             ORJSONRenderer()),
+        ]
+
+        self.stdout.write(f"Page of {page_size} jobs, best of {options['repeat']} runs")
+        header = f"{'variant':<18}{'bytes':>10}{'queries':>9}{'fetch ms':>10}{'serialize ms':>14}{'render ms':>11}"
+        self.stdout.write(header)
+        for label, queryset, serializer_class, request, renderer in variants:
+            fetch = serialize = render = float('inf')
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    page = list(queryset[:page_size])
+                    fetched = time.perf_counter()
+                    data = serializer_class(page, many=True, context={'request': request}).data
+                    serialized = time.perf_counter()
+                content = renderer.render(data)
+                rendered = time.perf_counter()
+                fetch = min(fetch, fetched - started)
+                serialize = min(serialize, serialized - fetched)
+                render = min(render, rendered - serialized)
+            self.stdout.write(
+                f"{label:<18}{len(content):>10}{len(queries.captured_queries):>9}"
+                f"{fetch * 1000:>10.2f}{serialize * 1000:>14.2f}{render * 1000:>11.2f}"
+            )
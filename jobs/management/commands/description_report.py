@@ -0,0 +1,70 @@
+import json
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from jobs.job_sources import get_http_session, get_sources
+from jobs.models import Job
+from jobs.text import html_to_text, summarize
+
+
+def _size(values):
+    return sum(len(value.encode('utf-8')) for value in values)
+
+
+def _vectorize(texts):
+    vectors = TfidfVectorizer(stop_words='english').fit_transform(texts)
+    return vectors.shape[1], vectors.nnz
+
+
+class Command(BaseCommand):
+    help = "Compare HTML job descriptions with their plain-text and summary forms on a feed sample"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help="Postings to sample per source")
+        parser.add_argument(
+            '--from-db', action='store_true',
+            help="Sample stored jobs instead of fetching the live feeds",
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        if options['from_db']:
+            sample = list(Job.objects.order_by('-created_at').values_list('title', 'description')[:limit])
+        else:
+            session = get_http_session()
+            sample = []
+            for source in get_sources():
+                # No saved validators: always take the head of the feed
+                records = islice(source.iter_records(session), limit)
+                sample += [(record.get('title') or '', record.get('description') or '') for record in records]
+        if not sample:
+            self.stdout.write("No job descriptions to sample.")
+            return
+
+        titles = [title for title, _ in sample]
+        html = [description for _, description in sample]
+        text = [html_to_text(description) for description in html]
+        summaries = [summarize(description) for description in text]
+
+        html_vocabulary, html_nnz = _vectorize([f"{t} {d}" for t, d in zip(titles, html)])
+        text_vocabulary, text_nnz = _vectorize([f"{t} {d}" for t, d in zip(titles, text)])
+        html_payload = _size(json.dumps(description) for description in html)
+        summary_payload = _size(json.dumps(summary) for summary in summaries)
+
+        rows = [
+            ("", "html", "plain text", "saving"),
+            ("description bytes", _size(html), _size(text)),
+            ("tf-idf vocabulary", html_vocabulary, text_vocabulary),
+            ("tf-idf non-zeros", html_nnz, text_nnz),
+            ("list payload bytes", html_payload, summary_payload),
+        ]
+        self.stdout.write(f"Sampled {len(sample)} descriptions")
+        widths = (20, 14, 14, 8)
+        self.stdout.write("".join(str(cell).ljust(width) for cell, width in zip(rows[0], widths)))
+        for label, before, after in rows[1:]:
+            saving = f"{100 * (1 - after / before):.0f}%" if before else "-"
+            self.stdout.write("".join(
+                str(cell).ljust(width) for cell, width in zip((label, before, after, saving), widths)
+            ))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from jobs.list_cache import bump_generation
+from jobs.models import Job
+from jobs.services.near_duplicates import NearDuplicateIndex
+
+
+class Command(BaseCommand):
+    help = "Sign and cluster stored jobs that have not been checked for near-duplicates yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Re-index every job, not only those without a signature",
+        )
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.order_by('id')
+        if not options['all']:
+            jobs = jobs.filter(minhash__isnull=True)
+
+        index = NearDuplicateIndex()
+        last_id = 0
+        indexed = duplicates = 0
+        while True:
+            # Oldest first, so the earliest copy of a posting stays canonical
+            batch = list(jobs.filter(id__gt=last_id).only('id', 'title', 'description_text')[:options['batch_size']])
+            if not batch:
+                break
+            duplicates += index.index_jobs(batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+        bump_generation()
+        self.stdout.write(f"Indexed {indexed} jobs, {duplicates} marked as near-duplicates.")
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from skillsverse_backend.mock_sui_node import MockSuiNode
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent GET requests at a running server and report throughput and latency; "
+        "run it against the WSGI and the ASGI deployment to compare them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help="URLs to request, in rotation")
+        parser.add_argument('--concurrency', type=int, default=100, help="Requests in flight at once")
+        parser.add_argument('--requests', type=int, default=1000, help="Total requests")
+        parser.add_argument('--token', help="JWT access token sent as a Bearer header")
+        parser.add_argument('--timeout', type=float, default=60.0, help="Seconds before a request counts as failed")
+        parser.add_argument(
+            '--mock-sui-port', type=int,
+            help="Also serve a mock Sui node on this port for the duration of the test "
+                 "(start the server under test with SUI_RPC_URL=http://127.0.0.1:<port>)",
+        )
+        parser.add_argument('--rpc-latency', type=float, default=0.5, help="Seconds the mock Sui node takes per call")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError("--concurrency and --requests must be positive")
+        node = None
+        if options['mock_sui_port']:
+            node = MockSuiNode(latency=options['rpc_latency'], port=options['mock_sui_port']).start()
+            self.stdout.write(f"Mock Sui node at {node.url} ({options['rpc_latency']}s per call)")
+        try:
+            latencies, statuses, elapsed = asyncio.run(self.run(options))
+        finally:
+            if node is not None:
+                node.stop()
+
+        latencies.sort()
+        ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400)
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} concurrent, {elapsed:.2f}s"
+        )
+        self.stdout.write(f"Throughput: {options['requests'] / elapsed:.1f} req/s ({ok} succeeded)")
+        self.stdout.write(
+            "Latency ms: p50 {:.0f}  p95 {:.0f}  p99 {:.0f}  max {:.0f}".format(
+                *(percentile(latencies, fraction) * 1000 for fraction in (0.5, 0.95, 0.99)),
+                (latencies[-1] if latencies else 0) * 1000,
+            )
+        )
+        self.stdout.write("Responses: " + ", ".join(f"{status}: {count}" for status, count in sorted(
+            statuses.items(), key=lambda item: str(item[0])
+        )))
+
+    async def run(self, options):
+        headers = {'Authorization': f"Bearer {options['token']}"} if options['token'] else {}
+        limits = httpx.Limits(max_connections=options['concurrency'], max_keepalive_connections=options['concurrency'])
+        latencies = []
+        statuses = {}
+        remaining = iter(range(options['requests']))
+        urls = options['urls']
+
+        async def worker(client):
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(urls[i % len(urls)])
+                    status = response.status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        async with httpx.AsyncClient(headers=headers, limits=limits, timeout=options['timeout']) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(options['concurrency'])))
+            elapsed = time.perf_counter() - started
+        return latencies, statuses, elapsed
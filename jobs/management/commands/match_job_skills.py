@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from jobs.list_cache import bump_generation
+from jobs.models import Job
+from jobs.services.skill_matcher import SkillMatcher
+
+
+class Command(BaseCommand):
+    help = "Recompute the skills of stored jobs, e.g. after the Skill table has grown"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        matcher = SkillMatcher()
+        jobs = Job.objects.order_by('id').only('id', 'title', 'description_text', 'tags')
+
+        last_id = 0
+        matched = links = 0
+        while True:
+            batch = list(jobs.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            links += matcher.assign_skills(batch)
+            matched += len(batch)
+            last_id = batch[-1].id
+
+        bump_generation()
+        self.stdout.write(f"Matched skills for {matched} jobs ({links} links).")
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from jobs.mock_job_board import MockJobBoard
+
+
+def add_board_arguments(parser):
+    """Options shared by every command that starts a mock board"""
+    parser.add_argument('--jobs', type=int, default=500, help="Synthetic postings per feed")
+    parser.add_argument('--page-size', type=int, default=100, help="Postings per Arbeitnow page")
+    parser.add_argument('--description-words', type=int, default=150)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests failed with a 503")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--recorded', action='append', default=[], metavar='SOURCE=PATH',
+        help="Replay a recorded response body for a source instead of synthetic data (repeatable)",
+    )
+
+
+def board_from_options(options, **kwargs):
+    recorded = {}
+    for entry in options['recorded']:
+        source, _, path = entry.partition('=')
+        recorded[source] = Path(path).read_bytes()
+    return MockJobBoard(
+        jobs=options['jobs'],
+        page_size=options['page_size'],
+        description_words=options['description_words'],
+        latency=options['latency'],
+        error_rate=options['error_rate'],
+        recorded=recorded,
+        seed=options['seed'],
+        **kwargs,
+    )
+
+
+class Command(BaseCommand):
+    help = "Serve mock RemoteOK and Arbeitnow feeds locally for offline ingest runs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001)
+        add_board_arguments(parser)
+
+    def handle(self, *args, **options):
+        board = board_from_options(options, host=options['host'], port=options['port'])
+        self.stdout.write(f"Mock job board listening on {board.base_url}")
+        self.stdout.write("Point ingest at it with:")
+        self.stdout.write(f"  export REMOTEOK_API_URL={board.urls['remoteok']}")
+        self.stdout.write(f"  export ARBEITNOW_API_URL={board.urls['arbeitnow']}")
+        try:
+            board.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            board.stop()
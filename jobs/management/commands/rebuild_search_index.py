@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from jobs.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the full-text job search index (and its SQLite sync triggers)"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_search_index(connection)
+        self.stdout.write(f"Rebuilt the job search index on {connection.vendor}.")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from skillsverse_backend.task_metrics import METRICS, RETENTION_WINDOWS, WINDOW_SECONDS, task_stats
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _format(metric, value):
+    if value is None:
+        return '-'
+    if metric == 'rss_delta':
+        return f"{value / (1024 * 1024):.1f}MB"
+    if value < 1:
+        return f"{value * 1000:.0f}ms"
+    return f"{value:.1f}s"
+
+
+class Command(BaseCommand):
+    help = "Print queue-wait, runtime and memory percentiles per Celery task"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--windows', type=int, default=RETENTION_WINDOWS,
+            help=f"Number of {WINDOW_SECONDS // 60}-minute windows to include (default: all retained)",
+        )
+
+    def handle(self, *args, **options):
+        stats = task_stats(windows=options['windows'], quantiles=QUANTILES)
+        if not stats:
+            self.stdout.write("No task metrics recorded yet.")
+            return
+
+        header = ['task', 'runs', 'retries', 'failures']
+        for metric in METRICS:
+            header += [f"{metric} p{int(q * 100)}" for q in QUANTILES]
+
+        rows = [header]
+        for task_name, entry in stats.items():
+            row = [task_name, str(entry['runs']), str(entry['retries']), str(entry['failures'])]
+            for metric in METRICS:
+                row += [_format(metric, entry[metric][q]) for q in QUANTILES]
+            rows.append(row)
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        for row in rows:
+            self.stdout.write("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
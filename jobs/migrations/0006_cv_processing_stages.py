@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+def mark_parsed_cvs(apps, schema_editor):
+    # CVs parsed before stages existed went through the whole pipeline
+    CV = apps.get_model('jobs', 'CV')
+    CV.objects.filter(is_parsed=True).update(processing_stage='recommended')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_jobrecommendation_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cv',
+            name='extracted_text',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='cv',
+            name='processing_stage',
+            field=models.CharField(choices=[('pending', 'Pending'), ('extracted', 'Text extracted'), ('analyzed', 'Analyzed'), ('persisted', 'Persisted'), ('recommended', 'Recommended')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='cv',
+            name='stage_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_parsed_cvs, migrations.RunPython.noop),
+    ]
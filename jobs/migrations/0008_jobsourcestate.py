@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_cv_created_by'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSourceState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=255, null=True)),
+                ('last_modified', models.CharField(blank=True, max_length=100, null=True)),
+                ('max_epoch', models.BigIntegerField(blank=True, null=True)),
+                ('last_fetched_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
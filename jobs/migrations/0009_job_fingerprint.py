@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:04
+
+from django.db import migrations, models
+
+from jobs.fingerprints import job_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Only ingested postings are fingerprinted; the first of any duplicates
+    # keeps the fingerprint so the unique index can be built
+    Job = apps.get_model('jobs', 'Job')
+    seen = set()
+    batch = []
+    ingested = Job.objects.exclude(source__isnull=True, external_link__isnull=True)
+    for job in ingested.only('id', 'external_link', 'title', 'company_name').order_by('id').iterator(chunk_size=2000):
+        fingerprint = job_fingerprint(job.external_link, job.title, job.company_name)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        job.fingerprint = fingerprint
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    Job.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_jobsourcestate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='job',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
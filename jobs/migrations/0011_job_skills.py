@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='jobs', to='jobs.skill'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:11
+
+from django.db import migrations, models
+
+from jobs.text import html_to_text, summarize
+
+
+def backfill_description_text(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.only('id', 'description').order_by('id').iterator(chunk_size=2000):
+        job.description_text = html_to_text(job.description)
+        job.summary = summarize(job.description_text)
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ['description_text', 'summary'])
+            batch = []
+    Job.objects.bulk_update(batch, ['description_text', 'summary'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='description_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='summary',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+        migrations.RunPython(backfill_description_text, migrations.RunPython.noop),
+    ]
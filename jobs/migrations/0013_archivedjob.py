@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_description_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('company_name', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('external_link', models.URLField(blank=True, null=True)),
+                ('company_logo', models.URLField(blank=True, null=True)),
+                ('slug', models.SlugField(db_index=False, max_length=255)),
+                ('tags', models.JSONField(default=list)),
+                ('employment_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('source', models.CharField(blank=True, max_length=100, null=True)),
+                ('epoch', models.BigIntegerField(blank=True, null=True)),
+                ('fingerprint', models.CharField(blank=True, max_length=64, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_archivedjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['canonical', '-created_at', 'id'], name='job_list_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:16
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+from jobs.search_index import install_search_index, uninstall_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_job_list_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Lower('location'), name='job_location_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employment_type'], name='job_employment_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['source'], name='job_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_min'], name='job_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_max'], name='job_salary_max_idx'),
+        ),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
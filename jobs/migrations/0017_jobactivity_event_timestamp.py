@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_cv_uploads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobactivity',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
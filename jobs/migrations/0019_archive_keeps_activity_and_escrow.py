@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_job_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedjob',
+            name='lock_amount',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='walrus_lock_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobactivity',
+            name='archived_job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='jobs.archivedjob'),
+        ),
+        migrations.AddField(
+            model_name='jobdailystats',
+            name='archived_job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_stats', to='jobs.archivedjob'),
+        ),
+        migrations.AlterField(
+            model_name='jobactivity',
+            name='job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='jobs.job'),
+        ),
+        migrations.AlterField(
+            model_name='jobdailystats',
+            name='job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_stats', to='jobs.job'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+# jobs.slugs.RESERVED_SLUGS when this migration was written
+RESERVED_SLUGS = ('create', 'bulk', 'search', 'activity', 'recommended', 'matches', 'cv')
+
+
+def reslug_reserved(apps, schema_editor):
+    # Jobs holding a route's path segment as their slug cannot be served; give them a suffix
+    Job = apps.get_model('jobs', 'Job')
+    for job in Job.objects.filter(slug__in=RESERVED_SLUGS).only('id', 'slug'):
+        suffix = 1
+        while Job.objects.filter(slug=f"{job.slug}-{suffix}").exists():
+            suffix += 1
+        Job.objects.filter(id=job.id).update(slug=f"{job.slug}-{suffix}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_archive_keeps_activity_and_escrow'),
+    ]
+
+    operations = [
+        migrations.RunPython(reslug_reserved, migrations.RunPython.noop),
+    ]
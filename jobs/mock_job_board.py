@@ -0,0 +1,219 @@
+"""
+Local stand-in for the external job boards.
+
+Serves RemoteOK- and Arbeitnow-shaped feeds from memory so ingest can be
+run and load-tested offline. Feeds are either synthetic (a configurable
+number of generated postings) or recorded responses replayed verbatim,
+and every response can be delayed or failed at random to mimic a slow or
+flaky board. Responses carry an ETag and honour If-None-Match, like the
+real boards' CDNs do.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WORDS = (
+    "build maintain scalable services team product customers data platform "
+    "design review ship features remote collaborate mentor engineers testing "
+    "deploy cloud infrastructure reliable secure performance api integration "
+    "python django react docker kubernetes aws postgresql redis machine learning"
+).split()
+TITLES = (
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer",
+    "Product Designer", "Mobile Developer", "QA Engineer", "Solutions Architect",
+)
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+TAGS = ("python", "javascript", "devops", "design", "remote", "senior", "junior", "aws")
+
+
+class MockJobBoard:
+    """
+    In-process HTTP server for the mock feeds.
+
+    ``urls`` maps each source name to its feed URL on this server, in the
+    shape expected by ``settings.JOB_SOURCE_URLS``.
+    """
+
+    def __init__(self, jobs=500, page_size=100, description_words=150, latency=0.0,
+                 error_rate=0.0, recorded=None, seed=0, host="127.0.0.1", port=0):
+        """
+        Args:
+            jobs (int): Synthetic postings per feed
+            page_size (int): Postings per page of the paginated (Arbeitnow) feed
+            description_words (int): Length of each synthetic description
+            latency (float): Seconds to wait before answering each request
+            error_rate (float): Fraction of requests answered with a 503
+            recorded (dict): Optional {source name: response body bytes} replayed instead of synthetic data
+            seed (int): Seed for the generated data and injected errors
+            host (str): Interface to listen on
+            port (int): Port to listen on; 0 picks a free one
+        """
+        self.jobs = jobs
+        self.page_size = page_size
+        self.description_words = description_words
+        self.latency = latency
+        self.error_rate = error_rate
+        self.recorded = recorded or {}
+        self.seed = seed
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.board = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def urls(self):
+        return {
+            "remoteok": f"{self.base_url}/remoteok",
+            "arbeitnow": f"{self.base_url}/arbeitnow",
+        }
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                return True
+            return False
+
+    def page(self, feed, number):
+        """Body and ETag of one feed page, rendered once and cached; None if there is no such page"""
+        key = (feed, number)
+        with self._lock:
+            if key not in self._pages:
+                body = self._render(feed, number)
+                etag = f'"{hashlib.sha1(body).hexdigest()}"' if body is not None else None
+                self._pages[key] = (body, etag)
+            return self._pages[key]
+
+    def _render(self, feed, number):
+        if feed in self.recorded:
+            return self.recorded[feed] if number == 1 else None
+        if feed == "remoteok":
+            if number != 1:
+                return None
+            meta = {"legal": "Mock feed for local testing"}
+            return json.dumps([meta] + [self._remoteok_job(i) for i in range(self.jobs)]).encode()
+        if feed == "arbeitnow":
+            pages = max(1, -(-self.jobs // self.page_size))
+            if number > pages:
+                return None
+            start = (number - 1) * self.page_size
+            end = min(start + self.page_size, self.jobs)
+            next_url = f"{self.urls['arbeitnow']}?page={number + 1}" if number < pages else None
+            return json.dumps({
+                "data": [self._arbeitnow_job(i) for i in range(start, end)],
+                "links": {"next": next_url},
+            }).encode()
+        return None
+
+    def _posting(self, feed, i):
+        # Deterministic per posting, so repeated renders describe the same jobs
+        rng = random.Random(f"{self.seed}:{feed}:{i}")
+        return {
+            "title": f"{rng.choice(TITLES)} {i}",
+            "company": rng.choice(COMPANIES),
+            "description": "<p>" + " ".join(rng.choice(WORDS) for _ in range(self.description_words)) + "</p>",
+            "tags": rng.sample(TAGS, 3),
+            # Newest first, one minute apart
+            "epoch": int(time.time()) - i * 60,
+            "url": f"{self.base_url}/{feed}/jobs/{i}",
+        }
+
+    def _remoteok_job(self, i):
+        posting = self._posting("remoteok", i)
+        return {
+            "position": posting["title"],
+            "company": posting["company"],
+            "description": posting["description"],
+            "location": "Remote",
+            "apply_url": posting["url"],
+            "tags": posting["tags"],
+            "salary_min": 50000 + i % 50 * 1000,
+            "salary_max": 90000 + i % 50 * 1000,
+            "epoch": posting["epoch"],
+        }
+
+    def _arbeitnow_job(self, i):
+        posting = self._posting("arbeitnow", i)
+        return {
+            "title": posting["title"],
+            "company_name": posting["company"],
+            "description": posting["description"],
+            "remote": i % 2 == 0,
+            "location": "Berlin",
+            "url": posting["url"],
+            "tags": posting["tags"],
+            "job_types": ["Full-time"],
+            "created_at": posting["epoch"],
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        board = self.server.board
+        if board.latency:
+            time.sleep(board.latency)
+        if board.should_fail():
+            self._send(503, b'{"error": "injected failure"}')
+            return
+
+        parts = urlsplit(self.path)
+        feed = parts.path.strip("/")
+        try:
+            number = int(parse_qs(parts.query).get("page", ["1"])[0])
+        except ValueError:
+            number = 1
+        body, etag = board.page(feed, number)
+        if body is None:
+            self._send(404, b'{"error": "not found"}')
+        elif self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
@@ -1,9 +1,12 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.text import slugify
 from django.utils.crypto import get_random_string
 import uuid
 import os
 from django.conf import settings
+from django.utils import timezone
+from .text import html_to_text, summarize
 
 def cv_upload_path(instance, filename):
     """Generate file path for uploaded CVs"""
@@ -27,7 +30,9 @@ class Job(models.Model):
     ]
 
     title = models.CharField(max_length=255)                      # Job title
-    description = models.TextField()                               # Detailed job description
+    description = models.TextField()                               # Detailed job description (HTML, as posted)
+    description_text = models.TextField(blank=True, default='', editable=False)  # Plain text of description, for indexing
+    summary = models.CharField(max_length=300, blank=True, default='', editable=False)  # Short plain-text excerpt for list views
     company_name = models.CharField(max_length=255)                # Company offering the job
     location = models.CharField(max_length=255, blank=True, null=True)  # Job location (optional)
     salary_min = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)  # Minimum salary (optional)
@@ -38,9 +43,13 @@ class Job(models.Model):
     tags = models.JSONField(default=list)                          # List of keywords related to the job
     responsibilities = models.JSONField(default=list)              # List of job responsibilities
     qualifications = models.JSONField(default=list)                # Required skills and qualifications
+    skills = models.ManyToManyField(Skill, blank=True, related_name='jobs')  # Skills found in the posting (see jobs.services.skill_matcher)
     employment_type = models.CharField(max_length=50, blank=True, null=True)  # e.g., full-time, part-time (optional)
     source = models.CharField(max_length=100, blank=True, null=True) # Source of the job posting (e.g., "RemoteOK")
     epoch = models.BigIntegerField(blank=True, null=True)          # Unix timestamp for job posting (optional)
+    fingerprint = models.CharField(max_length=64, unique=True, blank=True, null=True, editable=False)  # Identity of an ingested posting (see jobs.fingerprints)
+    minhash = models.BinaryField(blank=True, null=True, editable=False)  # MinHash signature of title + description
+    canonical = models.ForeignKey('self', on_delete=models.SET_NULL, blank=True, null=True, related_name='duplicates')  # Set when this posting near-duplicates another
 
     created_by = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='jobs') # Creator of the job
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')  # Job status
@@ -51,20 +60,109 @@ class Job(models.Model):
     lock_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)  # Amount locked on blockchain
     walrus_lock_id = models.CharField(max_length=255, blank=True, null=True)  # Reference to Walrus lock
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the job list: canonical postings, newest first.
+            # Leading with canonical lets "canonical IS NULL" and the ordering
+            # share one index instead of filtering on one and sorting.
+            models.Index(fields=['canonical', '-created_at', 'id'], name='job_list_created_id_idx'),
+            # Search filters (see jobs.search); the full-text index itself is
+            # backend-specific and created in migration 0015
+            models.Index(Lower('location'), name='job_location_lower_idx'),
+            models.Index(fields=['employment_type'], name='job_employment_type_idx'),
+            models.Index(fields=['source'], name='job_source_idx'),
+            models.Index(fields=['salary_min'], name='job_salary_min_idx'),
+            models.Index(fields=['salary_max'], name='job_salary_max_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
+            from .slugs import RESERVED_SLUGS  # jobs.slugs imports this module
             base_slug = slugify(self.title)
             unique_slug = base_slug
             count = 1
-            while Job.objects.filter(slug=unique_slug).exists():
+            while unique_slug in RESERVED_SLUGS or Job.objects.filter(slug=unique_slug).exists():
                 unique_slug = f"{base_slug}-{get_random_string(6)}"
             self.slug = unique_slug
+        self.set_description_text()
         super().save(*args, **kwargs)
 
+    def set_description_text(self):
+        """Derive the plain-text fields from the HTML description"""
+        self.description_text = html_to_text(self.description)
+        self.summary = summarize(self.description_text)
+
     def __str__(self):
         return self.title
 
 
+class JobLSHBucket(models.Model):
+    """One LSH band of a job's MinHash signature; jobs sharing a bucket are near-duplicate candidates"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='lsh_buckets')
+    bucket = models.BigIntegerField(db_index=True)  # Hash of (band number, band rows)
+
+    def __str__(self):
+        return f"{self.job_id}: {self.bucket}"
+
+
+class ArchivedJob(models.Model):
+    """An expired Job, moved out of the hot table by jobs.archive"""
+    original_id = models.BigIntegerField(unique=True)                  # Job.id before archival
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    company_name = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, blank=True, null=True)
+    salary_min = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+    salary_max = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+    external_link = models.URLField(blank=True, null=True)
+    company_logo = models.URLField(blank=True, null=True)
+    slug = models.SlugField(max_length=255, db_index=False)
+    tags = models.JSONField(default=list)
+    employment_type = models.CharField(max_length=50, blank=True, null=True)
+    source = models.CharField(max_length=100, blank=True, null=True)
+    epoch = models.BigIntegerField(blank=True, null=True)
+    fingerprint = models.CharField(max_length=64, blank=True, null=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True, related_name='archived_jobs')
+    status = models.CharField(max_length=20)                          # Job status when it was archived; open jobs are closed
+    created_at = models.DateTimeField()                               # When the Job was created
+    archived_at = models.DateTimeField(auto_now_add=True)
+    lock_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    walrus_lock_id = models.CharField(max_length=255, blank=True, null=True)
+
+    STATUS_CLOSED = 'closed'
+
+    # Job fields copied verbatim into the archive
+    COPIED_FIELDS = [
+        'title', 'description', 'company_name', 'location', 'salary_min',
+        'salary_max', 'external_link', 'company_logo', 'slug', 'tags',
+        'employment_type', 'source', 'epoch', 'fingerprint', 'created_by_id',
+        'status', 'created_at', 'lock_amount', 'walrus_lock_id',
+    ]
+
+    @classmethod
+    def from_job(cls, job):
+        archived = cls(original_id=job.id, **{field: getattr(job, field) for field in cls.COPIED_FIELDS})
+        if archived.status == 'open':
+            # Expired: no longer taking applications
+            archived.status = cls.STATUS_CLOSED
+        return archived
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class JobSourceState(models.Model):
+    """Incremental fetch state for one external job source"""
+    source = models.CharField(max_length=100, unique=True)             # Registry name of the source
+    etag = models.CharField(max_length=255, blank=True, null=True)      # ETag of the last full response
+    last_modified = models.CharField(max_length=100, blank=True, null=True)  # Last-Modified of the last full response
+    max_epoch = models.BigIntegerField(blank=True, null=True)           # Newest posting epoch already ingested
+    last_fetched_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.source} (up to {self.max_epoch})"
+
+
 class JobActivity(models.Model):
     ACTIVITY_CHOICES = [
         ('applied', 'Applied'),
@@ -73,9 +171,11 @@ class JobActivity(models.Model):
     ]
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activities")
-    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name="activities")
+    # Once the job is archived, job is cleared and archived_job takes over
+    job = models.ForeignKey('jobs.Job', on_delete=models.SET_NULL, null=True, blank=True, related_name="activities")
+    archived_job = models.ForeignKey(ArchivedJob, on_delete=models.SET_NULL, null=True, blank=True, related_name="activities")
     activity_type = models.CharField(max_length=20, choices=ACTIVITY_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)  # When the event happened; buffered events are stored later (see jobs.services.activity_buffer)
 
     class Meta:
         unique_together = ('user', 'job', 'activity_type')
@@ -83,6 +183,23 @@ class JobActivity(models.Model):
     def __str__(self):
         return f"{self.user} {self.activity_type} {self.job}"
 
+class JobDailyStats(models.Model):
+    """One day of a job's activity, rolled up from the Redis counters by jobs.popularity"""
+    # Once the job is archived, job is cleared and archived_job takes over
+    job = models.ForeignKey(Job, on_delete=models.SET_NULL, null=True, blank=True, related_name='daily_stats')
+    archived_job = models.ForeignKey(ArchivedJob, on_delete=models.SET_NULL, null=True, blank=True, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)  # HyperLogLog estimate, within about 1%
+
+    class Meta:
+        unique_together = ('job', 'date')
+
+    def __str__(self):
+        return f"{self.job_id} on {self.date}: {self.views} views"
+
 class CV(models.Model):
     """CV model to store uploaded CVs and their parsed data"""
     STATUS_CHOICES = (
@@ -92,12 +209,38 @@ class CV(models.Model):
         ('failed', 'Failed'),
     )
     
+    # Pipeline stages, in the order they complete. A retry resumes from the
+    # stage after the last one recorded here.
+    STAGE_PENDING = 'pending'
+    STAGE_EXTRACTED = 'extracted'
+    STAGE_ANALYZED = 'analyzed'
+    STAGE_PERSISTED = 'persisted'
+    STAGE_RECOMMENDED = 'recommended'
+    STAGE_CHOICES = (
+        (STAGE_PENDING, 'Pending'),
+        (STAGE_EXTRACTED, 'Text extracted'),
+        (STAGE_ANALYZED, 'Analyzed'),
+        (STAGE_PERSISTED, 'Persisted'),
+        (STAGE_RECOMMENDED, 'Recommended'),
+    )
+    
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='cvs', null=True, blank=True)
     file = models.FileField(upload_to=cv_upload_path)
     original_filename = models.CharField(max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     is_parsed= models.BooleanField(default=False)
     parsed_at = models.DateTimeField(auto_now_add=True, null=True)
+    processing_stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default=STAGE_PENDING)
+    stage_updated_at = models.DateTimeField(null=True, blank=True)
+    
+    # jobs.uploads.content_hash of the file; a user re-uploading the same
+    # file gets their existing CV back instead of a second parse
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    
+    # Raw text from the extraction stage, kept so analysis can be retried
+    # without re-reading the file
+    extracted_text = models.TextField(null=True, blank=True)
     
     # Parsed data (stored as JSON)
     parsed_data = models.JSONField(null=True, blank=True)
@@ -114,6 +257,54 @@ class CV(models.Model):
     def get_file_extension(self):
         """Get the file extension of the CV"""
         return os.path.splitext(self.file.name)[1].lower()
+    
+    def has_reached_stage(self, stage):
+        """Check whether the pipeline has already completed the given stage"""
+        stages = [choice[0] for choice in self.STAGE_CHOICES]
+        return stages.index(self.processing_stage) >= stages.index(stage)
+    
+    def mark_stage(self, stage, **fields):
+        """Record a completed pipeline stage together with its results"""
+        self.processing_stage = stage
+        self.stage_updated_at = timezone.now()
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.save(update_fields=['processing_stage', 'stage_updated_at', *fields])
+
+class CVUpload(models.Model):
+    """
+    A resumable CV upload in progress (see jobs.uploads)
+    
+    The file is written at its final storage location as the chunks
+    arrive; the CV is only created once all ``size`` bytes are in.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='cv_uploads')
+    original_filename = models.CharField(max_length=255)
+    file_name = models.CharField(max_length=255)                          # Storage name, as CV.file will have it
+    size = models.BigIntegerField()                                       # Declared total bytes
+    offset = models.BigIntegerField(default=0)                            # Bytes received so far
+    block_digests = models.BinaryField(default=b'', editable=False)       # SHA-256 of each completed hash block
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    content_type = models.CharField(max_length=100, blank=True, default='')  # Sniffed from the first bytes
+    cv = models.ForeignKey(CV, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.original_filename} ({self.offset}/{self.size} bytes)"
+    
+    @staticmethod
+    def file_name_for(filename):
+        return cv_upload_path(None, filename)
+    
+    @property
+    def extension(self):
+        return os.path.splitext(self.original_filename)[1].lower()
+    
+    @property
+    def is_complete(self):
+        return self.offset >= self.size
 
 class CVEducation(models.Model):
     """Education details extracted from a CV"""
@@ -0,0 +1,94 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from redis.exceptions import RedisError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from skillsverse_backend.walrus_db import db
+
+logger = logging.getLogger(__name__)
+
+COUNT_KEY = 'pagination:count:{}'
+
+
+def cached_count(queryset):
+    """
+    Row count of a queryset, shared between requests for PAGINATION_COUNT_TTL seconds
+
+    Counting a large table on every page request costs more than the page
+    itself; a total that is a few seconds stale is fine for a UI.
+    """
+    sql, params = queryset.query.sql_with_params()
+    key = COUNT_KEY.format(hashlib.sha1(f"{sql}|{params}".encode('utf-8')).hexdigest())
+    try:
+        cached = db.get(key)
+        if cached is not None:
+            return int(cached)
+    except RedisError as e:
+        logger.warning(f"Count cache unavailable: {e}")
+        return queryset.count()
+
+    count = queryset.count()
+    try:
+        db.set(key, count, ex=settings.PAGINATION_COUNT_TTL)
+    except RedisError as e:
+        logger.warning(f"Count cache unavailable: {e}")
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            return cached_count(self.object_list)
+        return super().count
+
+
+class StandardResultsPagination(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
+    page_size = 12
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CVPagination(PageNumberPagination):
+    """A user's own CVs: few, and counted live so a new upload shows up at once"""
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+
+
+class JobCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created_at, id).
+
+    Each page is a range scan from the cursor on the matching composite
+    index, so deep pages cost the same as the first one. ``count`` is the
+    cached total, for display only.
+    """
+    page_size = 12
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = cached_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'count': self.count,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
@@ -0,0 +1,231 @@
+"""
+Per-job popularity counted in Redis.
+
+Every activity event for an existing job increments its counter for the
+day (a hash of views, saves and applications). Saves and applications count
+once per user, job and day: the user is added to the day's set of savers or
+applicants first, and the counter moves only when they were not in it. A
+viewed event also adds the user to the job's HyperLogLog of the day's
+viewers, which estimates unique viewers in 12 KB at most instead of storing
+them. Day keys live JOB_POPULARITY_DAYS, plus a margin for the last rollup.
+
+A periodic rollup copies each day's counters into JobDailyStats, and
+recomputes every active job's popularity score into one sorted set: the
+unique viewers over the window (the union of the daily HyperLogLogs, so a
+user viewing on several days counts once) plus weighted saves. Lists and
+the recommender read scores from that set, so nothing aggregates
+JobActivity on a request.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from skillsverse_backend.walrus_db import db, get_async_db
+from .list_cache import bump_generation
+from .models import Job, JobDailyStats
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_KEY = 'job:stats:{day}:{job_id}'
+VIEWERS_KEY = 'job:viewers:{day}:{job_id}'
+USERS_KEY = 'job:{field}:{day}:{job_id}:users'  # Who saved or applied, for counting them once
+ACTIVE_JOBS_KEY = 'job:stats:{day}:jobs'  # Jobs with any activity that day
+POPULARITY_KEY = 'job:popularity'
+
+# Activity type -> counter field and JobDailyStats column
+COUNTER_FIELDS = {
+    'viewed': 'views',
+    'saved': 'saves',
+    'applied': 'applications',
+}
+ONCE_PER_USER = {'saved', 'applied'}
+
+
+def _day_keys_ttl():
+    # The day before the window is still rolled up once after midnight
+    return (settings.JOB_POPULARITY_DAYS + 2) * 24 * 3600
+
+
+def record_activity(user_id, events, day=None):
+    """
+    Count a user's activity events
+
+    Events for jobs that do not exist are dropped, as are saves and
+    applications the user already made to the job that day.
+
+    Args:
+        user_id (int): User the events belong to
+        events (list): (job_id, activity_type) pairs
+        day (date): Day to count them on; today by default
+    """
+    job_ids = set(Job.objects.filter(id__in={job_id for job_id, _ in events}).values_list('id', flat=True))
+    events = [(job_id, activity_type) for job_id, activity_type in events if job_id in job_ids]
+    if not events:
+        return
+    day = day or timezone.localdate()
+    ttl = _day_keys_ttl()
+    try:
+        once = [(job_id, activity_type) for job_id, activity_type in events if activity_type in ONCE_PER_USER]
+        if once:
+            with db.pipeline(transaction=False) as pipe:
+                for job_id, activity_type in once:
+                    users = USERS_KEY.format(field=COUNTER_FIELDS[activity_type], day=day, job_id=job_id)
+                    pipe.sadd(users, user_id)
+                    pipe.expire(users, ttl)
+                added = pipe.execute()[::2]
+            # A repeat within the request is dropped too: only its first SADD adds the user
+            events = [event for event in events if event[1] not in ONCE_PER_USER]
+            events += [event for event, is_new in zip(once, added) if is_new]
+
+        with db.pipeline(transaction=False) as pipe:
+            for job_id, activity_type in events:
+                counters = COUNTERS_KEY.format(day=day, job_id=job_id)
+                pipe.hincrby(counters, COUNTER_FIELDS[activity_type], 1)
+                pipe.expire(counters, ttl)
+                if activity_type == 'viewed':
+                    viewers = VIEWERS_KEY.format(day=day, job_id=job_id)
+                    pipe.pfadd(viewers, user_id)
+                    pipe.expire(viewers, ttl)
+            active = ACTIVE_JOBS_KEY.format(day=day)
+            pipe.sadd(active, *job_ids)
+            pipe.expire(active, ttl)
+            pipe.execute()
+    except RedisError as e:
+        # The events themselves are still stored (see jobs.services.activity_buffer)
+        logger.warning(f"Could not count job activity: {e}")
+
+
+def live_stats(job_id, day=None):
+    """
+    A job's counters so far today, straight from Redis
+
+    Returns:
+        dict: views, saves, applications and the estimated unique viewers
+    """
+    day = day or timezone.localdate()
+    with db.pipeline(transaction=False) as pipe:
+        pipe.hgetall(COUNTERS_KEY.format(day=day, job_id=job_id))
+        pipe.pfcount(VIEWERS_KEY.format(day=day, job_id=job_id))
+        counters, unique_viewers = pipe.execute()
+    stats = {field: int(counters.get(field.encode(), 0)) for field in COUNTER_FIELDS.values()}
+    stats['unique_viewers'] = unique_viewers
+    return stats
+
+
+def rollup_daily_stats(day):
+    """
+    Copy one day's counters into JobDailyStats
+
+    Idempotent: a day's rows are overwritten with its current totals, so the
+    rollup can run any number of times while the day is in progress.
+
+    Returns:
+        int: Rows written
+    """
+    job_ids = sorted(int(job_id) for job_id in db.smembers(ACTIVE_JOBS_KEY.format(day=day)))
+    if not job_ids:
+        return 0
+    with db.pipeline(transaction=False) as pipe:
+        for job_id in job_ids:
+            pipe.hgetall(COUNTERS_KEY.format(day=day, job_id=job_id))
+            pipe.pfcount(VIEWERS_KEY.format(day=day, job_id=job_id))
+        replies = pipe.execute()
+
+    # Jobs deleted or archived since keep their counters out of the table
+    live_ids = set(Job.objects.filter(id__in=job_ids).values_list('id', flat=True))
+    rows = []
+    for i, job_id in enumerate(job_ids):
+        if job_id not in live_ids:
+            continue
+        counters, unique_viewers = replies[2 * i], replies[2 * i + 1]
+        rows.append(JobDailyStats(
+            job_id=job_id, date=day, unique_viewers=unique_viewers,
+            **{field: int(counters.get(field.encode(), 0)) for field in COUNTER_FIELDS.values()},
+        ))
+    JobDailyStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['job', 'date'],
+        update_fields=['views', 'saves', 'applications', 'unique_viewers'],
+        batch_size=1000,
+    )
+    return len(rows)
+
+
+def refresh_popularity(today=None):
+    """
+    Recompute the popularity of every job active within JOB_POPULARITY_DAYS
+
+    Returns:
+        int: Jobs scored
+    """
+    today = today or timezone.localdate()
+    days = [today - timedelta(days=offset) for offset in range(settings.JOB_POPULARITY_DAYS)]
+    job_ids = sorted({int(job_id) for job_id in db.sunion([ACTIVE_JOBS_KEY.format(day=day) for day in days])})
+
+    scores = {}
+    if job_ids:
+        with db.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.pfcount(*(VIEWERS_KEY.format(day=day, job_id=job_id) for day in days))
+                for day in days:
+                    pipe.hget(COUNTERS_KEY.format(day=day, job_id=job_id), 'saves')
+            replies = iter(pipe.execute())
+        for job_id in job_ids:
+            unique_viewers = next(replies)
+            saves = sum(int(next(replies) or 0) for _ in days)
+            scores[job_id] = unique_viewers + settings.JOB_POPULARITY_SAVE_WEIGHT * saves
+
+    with db.pipeline(transaction=True) as pipe:
+        pipe.delete(POPULARITY_KEY)
+        if scores:
+            pipe.zadd(POPULARITY_KEY, scores)
+        pipe.execute()
+    # Cached job list pages carry the old scores
+    bump_generation()
+    return len(scores)
+
+
+def _scores(job_ids, replies):
+    return {job_id: score or 0.0 for job_id, score in zip(job_ids, replies)}
+
+
+def popularity(job_ids):
+    """
+    Popularity scores of jobs; 0 for jobs nobody has interacted with lately
+
+    Returns:
+        dict: Job id -> score
+    """
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    return _scores(job_ids, db.zmscore(POPULARITY_KEY, job_ids))
+
+
+def attach_popularity(jobs):
+    """Set ``popularity`` on each job for JobListSerializer; left unset when Redis is down"""
+    try:
+        scores = popularity(job.id for job in jobs)
+    except RedisError as e:
+        logger.warning(f"Job popularity unavailable: {e}")
+        return
+    for job in jobs:
+        job.popularity = scores[job.id]
+
+
+async def aattach_popularity(jobs):
+    """attach_popularity for async views"""
+    if not jobs:
+        return
+    job_ids = [job.id for job in jobs]
+    try:
+        scores = _scores(job_ids, await get_async_db().zmscore(POPULARITY_KEY, job_ids))
+    except RedisError as e:
+        logger.warning(f"Job popularity unavailable: {e}")
+        return
+    for job in jobs:
+        job.popularity = scores[job.id]
@@ -0,0 +1,85 @@
+"""
+Log of jobs added to the recommender index, shared by every worker.
+
+Each worker process keeps its own JobRecommender (see
+jobs.tasks.get_job_recommender). Indexing new jobs appends their ids to a
+sorted set in Redis, scored by an increasing log *version*. A worker
+remembers the version its index has reached and, before using the index,
+adds the jobs logged since. Only the last LOG_VERSIONS versions are kept; a
+worker further behind than that rebuilds its index instead.
+"""
+import logging
+
+from redis.exceptions import RedisError
+
+from skillsverse_backend.walrus_db import db
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'recommender:index:version'
+LOG_KEY = 'recommender:index:log'
+LOG_VERSIONS = 1000
+
+# KEYS: version, log; ARGV: versions to keep, then the job ids
+# Returns the new version
+PUBLISH_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+    redis.call('ZADD', KEYS[2], version, ARGV[i])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', version - tonumber(ARGV[1]))
+return version
+"""
+
+_publish = db.register_script(PUBLISH_SCRIPT)
+
+
+def current_version():
+    """Latest log version, or None when Redis is unavailable"""
+    try:
+        return int(db.get(VERSION_KEY) or 0)
+    except RedisError as e:
+        logger.warning(f"Recommender index log unavailable: {e}")
+        return None
+
+
+def publish(job_ids):
+    """
+    Log jobs for every worker to add to its index
+
+    Returns:
+        int: The new version, or None when Redis is unavailable
+    """
+    if not job_ids:
+        return None
+    try:
+        return _publish(keys=[VERSION_KEY, LOG_KEY], args=[LOG_VERSIONS, *job_ids])
+    except RedisError as e:
+        # Workers still pick the jobs up at their next full rebuild
+        logger.warning(f"Could not log {len(job_ids)} new jobs for the recommender index: {e}")
+        return None
+
+
+def jobs_since(version):
+    """
+    Jobs logged after ``version``
+
+    Args:
+        version (int): Version the caller's index has reached; None if unknown
+
+    Returns:
+        tuple: (latest version, job ids). The ids are None when the log no
+        longer reaches back to ``version``, or was reset, so the index must
+        be rebuilt. None instead of a tuple when Redis is unavailable.
+    """
+    try:
+        latest = int(db.get(VERSION_KEY) or 0)
+        if latest == version:
+            return latest, []
+        if version is None or latest < version or version < latest - LOG_VERSIONS:
+            return latest, None
+        job_ids = db.zrangebyscore(LOG_KEY, f'({version}', latest)
+    except RedisError as e:
+        logger.warning(f"Recommender index log unavailable: {e}")
+        return None
+    return latest, [int(job_id) for job_id in job_ids]
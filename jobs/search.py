@@ -0,0 +1,146 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+
+from .models import Job
+from .search_index import SQLITE_FTS_TABLE
+
+_TERM = re.compile(r"\w+")
+
+# bm25 column weights: title, company_name, description_text, tags
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0, 5.0)
+
+
+def _fts_phrase(text):
+    """An FTS5 phrase for free text; quoting every token keeps user input from being read as query syntax"""
+    return " ".join(f'"{term}"' for term in _TERM.findall(text))
+
+
+def _sqlite_match(query, tags):
+    clauses = []
+    if query:
+        # Every term must match, in any column; the last one may be a prefix
+        terms = _TERM.findall(query)
+        clauses += [f'"{term}"' for term in terms[:-1]]
+        clauses.append(f'"{terms[-1]}"*')
+    for tag in tags:
+        clauses.append(f"tags : ({_fts_phrase(tag)})")
+    return " AND ".join(clauses)
+
+
+class RankedSearchResults:
+    """
+    SQLite full-text matches in bm25 order, sliceable like a QuerySet for pagination.
+
+    A page is ranked by a query on the FTS table alone, with the structured
+    filters as a non-correlated ``rowid IN (...)`` subquery, then hydrated
+    with one query. Joining the FTS table to jobs_job instead lets SQLite's
+    planner start from a filter index and re-run the full-text query for
+    every candidate row, which is orders of magnitude slower.
+    """
+    ordered = True
+
+    def __init__(self, matches, match):
+        self.matches = matches  # QuerySet of every matching job, unordered
+        self.match = match      # FTS5 query string
+
+    def count(self):
+        return self.matches.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        limit = -1 if key.stop is None else max(0, key.stop - start)
+        filter_sql, filter_params = self.matches.values('id').query.sql_with_params()
+        weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND +rowid IN ({filter_sql}) "
+                # bm25() is lower for better matches; newer postings break ties
+                f"ORDER BY bm25({SQLITE_FTS_TABLE}, {weights}), rowid DESC LIMIT %s OFFSET %s",
+                [self.match, *filter_params, limit, start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        jobs = {job.id: job for job in self.matches.filter(id__in=ids)}
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
+
+def _full_text(queryset, query, tags):
+    if connection.vendor == 'sqlite':
+        match = _sqlite_match(query, tags)
+        # Evaluated once and kept as a temporary index, whichever side the planner starts from
+        matches = queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s", [match])
+        )
+        if not query:
+            return matches.order_by('-created_at')
+        return RankedSearchResults(matches, match)
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+
+        for tag in tags:
+            queryset = queryset.filter(tags__contains=[tag])
+        if not query:
+            return queryset.order_by('-created_at')
+        search_query = SearchQuery(query, search_type='websearch', config='english')
+        vector = RawSQL('"jobs_job"."search_vector"', [], output_field=SearchVectorField())
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(vector, search_query))
+            .order_by('-rank', '-created_at')
+        )
+
+    # Other backends: unindexed substring search
+    for term in _TERM.findall(query or ""):
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description_text__icontains=term))
+    for tag in tags:
+        queryset = queryset.filter(tags__contains=[tag])
+    return queryset.order_by('-created_at')
+
+
+def search_jobs(query="", location=None, employment_type=None, salary_min=None,
+                salary_max=None, source=None, tags=(), queryset=None):
+    """
+    Canonical jobs matching a full-text query and structured filters, best matches first
+
+    Args:
+        query (str): Free text matched against title, company, description and tags
+        location (str): Case-insensitive exact location, e.g. "remote"
+        employment_type (str): Exact employment type, e.g. "Full-time"
+        salary_min (Decimal): Only jobs whose salary range reaches at least this much
+        salary_max (Decimal): Only jobs whose salary range starts at or below this
+        source (str): Exact Job.source, e.g. "RemoteOK"
+        tags (list): Tags that must all be present
+        queryset (QuerySet): Base queryset, e.g. with select_related() applied
+
+    Returns:
+        QuerySet or RankedSearchResults: Jobs ordered by relevance (newest
+        first without a query)
+    """
+    queryset = (Job.objects.all() if queryset is None else queryset).filter(canonical__isnull=True)
+    if location:
+        # Matches the Lower(location) index
+        queryset = queryset.alias(location_lower=Lower('location')).filter(location_lower=location.lower())
+    if employment_type:
+        queryset = queryset.filter(employment_type=employment_type)
+    if source:
+        queryset = queryset.filter(source=source)
+    if salary_min is not None:
+        queryset = queryset.filter(salary_max__gte=salary_min)
+    if salary_max is not None:
+        queryset = queryset.filter(salary_min__lte=salary_max)
+
+    tags = [tag for tag in tags if _TERM.search(tag)]
+    if not _TERM.search(query or "") and not tags:
+        return queryset.order_by('-created_at')
+    return _full_text(queryset, query if _TERM.search(query or "") else "", tags)
@@ -0,0 +1,95 @@
+"""
+Backend-specific full-text index over jobs.
+
+SQLite gets an external-content FTS5 table (``jobs_job_fts``) kept in sync
+with ``jobs_job`` by triggers; Postgres gets a generated, weighted
+``search_vector`` column with a GIN index, plus a GIN index on tags. Both
+index the title, company name, plain-text description and tags.
+
+Django knows nothing about these objects. On SQLite, a migration that
+rebuilds the ``jobs_job`` table (most field alterations do) drops the
+triggers, so such a migration must call ``install_search_index`` again;
+``python manage.py rebuild_search_index`` repairs an existing database.
+"""
+
+SQLITE_FTS_TABLE = 'jobs_job_fts'
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_job_fts USING fts5(
+        title, company_name, description_text, tags,
+        content='jobs_job', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_insert AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(rowid, title, company_name, description_text, tags)
+        VALUES (new.id, new.title, new.company_name, new.description_text, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_delete AFTER DELETE ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(jobs_job_fts, rowid, title, company_name, description_text, tags)
+        VALUES ('delete', old.id, old.title, old.company_name, old.description_text, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_job_fts_update
+    AFTER UPDATE OF title, company_name, description_text, tags ON jobs_job BEGIN
+        INSERT INTO jobs_job_fts(jobs_job_fts, rowid, title, company_name, description_text, tags)
+        VALUES ('delete', old.id, old.title, old.company_name, old.description_text, old.tags);
+        INSERT INTO jobs_job_fts(rowid, title, company_name, description_text, tags)
+        VALUES (new.id, new.title, new.company_name, new.description_text, new.tags);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO jobs_job_fts(jobs_job_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS jobs_job_fts_update",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_job_fts_insert",
+    "DROP TABLE IF EXISTS jobs_job_fts",
+]
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE jobs_job ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(company_name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(tags, '[]'::jsonb)), 'B') ||
+        setweight(to_tsvector('english', coalesce(description_text, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS job_search_vector_idx ON jobs_job USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS job_tags_idx ON jobs_job USING GIN (tags jsonb_path_ops)",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS job_tags_idx",
+    "DROP INDEX IF EXISTS job_search_vector_idx",
+    "ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector",
+]
+
+INSTALL = {'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRES_INSTALL}
+UNINSTALL = {'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRES_UNINSTALL}
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def install_search_index(apps, schema_editor):
+    """Create (or repair) the full-text index; usable as a RunPython operation"""
+    _execute(schema_editor.connection, INSTALL)
+
+
+def uninstall_search_index(apps, schema_editor):
+    _execute(schema_editor.connection, UNINSTALL)
+
+
+def rebuild_search_index(connection):
+    """Drop and recreate the full-text index from the current table contents"""
+    _execute(connection, UNINSTALL)
+    _execute(connection, INSTALL)
@@ -1,6 +1,10 @@
+import os
+from decimal import Decimal
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from rest_framework import serializers
-from .models import Job, CV, Skill, CVEducation, CVWorkExperience, CVContactInfo, JobRecommendation
+from django.conf import settings
+from .models import Job, CV, CVUpload, Skill, CVEducation, CVWorkExperience, CVContactInfo, JobRecommendation, JobActivity
+from .uploads import CV_FILE_EXTENSIONS
 
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
@@ -34,28 +38,148 @@ class JobSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'slug']
 
+class SparseFieldsetMixin:
+    """
+    Limits the output to the comma-separated ``?fields=`` of the request,
+    e.g. ``?fields=id,title,summary``. Unknown names are ignored.
+    """
+    
+    @classmethod
+    def requested_fields(cls, request):
+        """Names of the Meta.fields a request asked for, all of them by default"""
+        all_fields = list(cls.Meta.fields)
+        raw = request.query_params.get('fields') if request is not None else None
+        if not raw:
+            return all_fields
+        wanted = {name.strip() for name in raw.split(',')}
+        return [name for name in all_fields if name in wanted] or all_fields
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.query_params.get('fields'):
+            wanted = set(self.requested_fields(request))
+            for name in list(self.fields):
+                if name not in wanted:
+                    self.fields.pop(name)
+
+class JobListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Job in list responses: a plain-text summary instead of the full HTML description"""
+    skills = SkillSerializer(many=True, read_only=True)
+    # Set by views that look it up (see jobs.popularity.attach_popularity), null elsewhere
+    popularity = serializers.FloatField(read_only=True, allow_null=True)
+    
+    # Fields that are not Job columns
+    COMPUTED_FIELDS = ('skills', 'popularity')
+    
+    # Fields whose model value is already what JSON needs
+    PLAIN_FIELD_TYPES = (serializers.CharField, serializers.IntegerField, serializers.JSONField)
+    
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'title', 'summary', 'company_name', 'location',
+            'salary_min', 'salary_max', 'employment_type', 'created_at',
+            'slug', 'tags', 'skills', 'company_logo', 'source', 'popularity'
+        ]
+        read_only_fields = fields
+    
+    @cached_property
+    def _plain_fields(self):
+        return {
+            field.field_name for field in self._readable_fields
+            if isinstance(field, self.PLAIN_FIELD_TYPES) and field.source == field.field_name
+        }
+    
+    def to_representation(self, instance):
+        # Same output as ModelSerializer.to_representation, but plain columns
+        # are copied straight from the instance; only dates, decimals and
+        # nested skills go through their field's conversion
+        plain_fields = self._plain_fields
+        data = {}
+        for field in self._readable_fields:
+            name = field.field_name
+            if name in plain_fields:
+                data[name] = getattr(instance, name)
+                continue
+            value = field.get_attribute(instance)
+            data[name] = None if value is None else field.to_representation(value)
+        return data
+
+class JobSearchParamsSerializer(serializers.Serializer):
+    """Query parameters of the job search endpoint"""
+    q = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    location = serializers.CharField(required=False, max_length=255)
+    employment_type = serializers.CharField(required=False, max_length=50)
+    salary_min = serializers.DecimalField(required=False, max_digits=12, decimal_places=2, min_value=Decimal('0'))
+    salary_max = serializers.DecimalField(required=False, max_digits=12, decimal_places=2, min_value=Decimal('0'))
+    source = serializers.CharField(required=False, max_length=100)
+    tags = serializers.CharField(required=False, help_text="Comma-separated; all must match")
+    
+    def validate_tags(self, value):
+        return [tag.strip() for tag in value.split(',') if tag.strip()]
+
 class JobRecommendationSerializer(serializers.ModelSerializer):
-    job = JobSerializer(read_only=True)
+    job = JobListSerializer(read_only=True)
     
     class Meta:
         model = JobRecommendation
         fields = ['id', 'job', 'match_score', 'created_at']
         read_only_fields = ['job', 'match_score', 'created_at']
+
+class JobActivityEventSerializer(serializers.Serializer):
+    """An activity event as posted; the job is checked when the event is flushed"""
+    job = serializers.IntegerField(min_value=1)
+    activity_type = serializers.ChoiceField(choices=JobActivity.ACTIVITY_CHOICES)
+
+class RecommendedJobSerializer(serializers.Serializer):
+    """A job from a user's recommendation feed, annotated with its best match_score"""
+    job = JobListSerializer(source='*', read_only=True)
+    match_score = serializers.FloatField(read_only=True)
         
 class CVUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = CV
-        fields = ('file', 'original_filename')
+        fields = ('id', 'file', 'original_filename', 'status', 'uploaded_at')
+        read_only_fields = ('id', 'status', 'uploaded_at')
+        extra_kwargs = {'original_filename': {'required': False}}
+    
+    def create(self, validated_data):
+        validated_data.setdefault('original_filename', validated_data['file'].name)
+        return super().create(validated_data)
         
     def validate_file(self, value):
         """Validate file extension"""
         ext = os.path.splitext(value.name)[1].lower()
-        valid_extensions = ['.pdf', '.docx', '.txt']
-        if ext not in valid_extensions:
+        if ext not in CV_FILE_EXTENSIONS:
+            raise serializers.ValidationError(
+                'Unsupported file extension. Please upload a PDF, DOCX, or TXT file.'
+            )
+        return value
+
+class CVUploadSessionSerializer(serializers.ModelSerializer):
+    """A resumable CV upload; the client declares the file name and size up front"""
+    class Meta:
+        model = CVUpload
+        fields = ('id', 'original_filename', 'size', 'offset', 'content_type', 'cv', 'created_at')
+        read_only_fields = ('id', 'offset', 'content_type', 'cv', 'created_at')
+    
+    def validate_original_filename(self, value):
+        ext = os.path.splitext(value)[1].lower()
+        if ext not in CV_FILE_EXTENSIONS:
             raise serializers.ValidationError(
                 'Unsupported file extension. Please upload a PDF, DOCX, or TXT file.'
             )
         return value
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('The file is empty.')
+        if value > settings.CV_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'CVs are limited to {settings.CV_UPLOAD_MAX_SIZE // (1024 * 1024)} MB.'
+            )
+        return value
 
 class CVSerializer(serializers.ModelSerializer):
     skills = serializers.SerializerMethodField()
@@ -1,8 +1,16 @@
+import logging
+
 import numpy as np
-from scipy.sparse import csr_matrix
+from django.conf import settings
+from redis.exceptions import RedisError
+from scipy.sparse import csr_matrix, vstack
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from jobs.models import Job, JobRecommendation, CV, JobActivity
+from jobs.feed import refresh_user_feeds
+from jobs.popularity import popularity
+
+logger = logging.getLogger(__name__)
 
 class JobRecommender:
     """Service class for recommending jobs based on CV data and user activities"""
@@ -13,56 +21,116 @@ class JobRecommender:
         self.job_listings = []
         self.job_vectors = None
         self.job_id_to_index = {}
+        self.popularity_scores = None
         self.update_job_vectors()
         # Clean up old recommendations with low scores
-        JobRecommendation.objects.filter(match_score__lt=30).delete()
+        low_scores = JobRecommendation.objects.filter(match_score__lt=30)
+        affected_users = set(low_scores.values_list('cv__created_by_id', flat=True).distinct())
+        low_scores.delete()
+        refresh_user_feeds(affected_users)
+    
+    def _indexable_jobs(self):
+        # Near-duplicates would crowd the top of the list with one posting
+        return Job.objects.filter(canonical__isnull=True).defer('description').prefetch_related('skills')
+    
+    def _job_text(self, job):
+        # Plain text keeps markup out of the vocabulary
+        job_text = f"{job.title} {job.description_text} "
+        job_text += " ".join(skill.name for skill in job.skills.all())
+        return job_text
     
     def update_job_vectors(self):
         """Update job vectors and index mapping from database"""
-        job_listings = Job.objects.all()
+        job_listings = self._indexable_jobs()
         if not job_listings.exists():
             self.job_listings = []
             self.job_vectors = None
             self.job_id_to_index = {}
+            self.popularity_scores = None
             return
         
         self.job_listings = list(job_listings)
         self.job_id_to_index = {job.id: idx for idx, job in enumerate(self.job_listings)}
-        job_texts = []
+        self.job_vectors = self.vectorizer.fit_transform(self._job_text(job) for job in self.job_listings)
+        self.popularity_scores = self._popularity_scores(self.job_listings)
+    
+    def _popularity_scores(self, jobs):
+        """Popularity of each job, scaled so the most popular one scores 1"""
+        try:
+            scores = popularity(job.id for job in jobs)
+        except RedisError as e:
+            logger.warning(f"Job popularity unavailable, recommending without it: {e}")
+            return np.zeros(len(jobs))
+        values = np.array([scores[job.id] for job in jobs], dtype=float)
+        top = values.max() if len(values) else 0
+        return values / top if top > 0 else values
+    
+    def add_jobs(self, job_ids):
+        """
+        Add newly created jobs to the index without refitting it
+        
+        The new postings are vectorized with the current vocabulary and
+        appended to the job matrix, so they can be recommended straight
+        away. Words the vocabulary lacks count from the next full rebuild.
+        
+        Args:
+            job_ids (list): IDs of saved jobs; ones already indexed are skipped
         
-        for job in self.job_listings:
-            job_text = f"{job.title} {job.description} "
-            job_text += " ".join(skill.name for skill in job.skills.all())
-            job_texts.append(job_text)
+        Returns:
+            int: Number of jobs added
+        """
+        if self.job_vectors is None:
+            # Nothing fitted yet, so there is no vocabulary to extend
+            self.update_job_vectors()
+            return len(self.job_listings)
         
-        self.job_vectors = self.vectorizer.fit_transform(job_texts)
+        new_ids = [job_id for job_id in job_ids if job_id not in self.job_id_to_index]
+        new_jobs = list(self._indexable_jobs().filter(id__in=new_ids).order_by('id'))
+        if not new_jobs:
+            return 0
+        
+        new_vectors = self.vectorizer.transform(self._job_text(job) for job in new_jobs)
+        self.job_vectors = vstack([self.job_vectors, new_vectors], format='csr')
+        # New postings have no activity yet
+        self.popularity_scores = np.concatenate([self.popularity_scores, np.zeros(len(new_jobs))])
+        for job in new_jobs:
+            self.job_id_to_index[job.id] = len(self.job_listings)
+            self.job_listings.append(job)
+        return len(new_jobs)
     
     def recommend_jobs_for_cv(self, cv_id, num_recommendations=10):
-        """Recommend jobs by combining CV and user activity data"""
-        try:
-            cv_obj = CV.objects.get(id=cv_id)
-            user = cv_obj.created_by  # Adjust based on CV's user field
-            
-            JobRecommendation.objects.filter(cv=cv_obj).delete()
-            
-            if not self.job_listings or self.job_vectors is None:
-                return []
-            
-            # CV-based similarity
-            cv_text = self._extract_cv_text(cv_obj)
-            cv_vector = self.vectorizer.transform([cv_text])
-            cv_scores = cosine_similarity(cv_vector, self.job_vectors).flatten()
-            
-            # Activity-based similarity
-            activity_scores = self._calculate_activity_scores(user)
-            
-            # Combine scores
-            combined_scores = 0.7 * cv_scores + 0.3 * activity_scores
-            return self._save_recommendations(cv_obj, combined_scores, num_recommendations)
+        """
+        Recommend jobs by combining CV and user activity data
         
-        except Exception as e:
-            print(f"Error recommending jobs: {str(e)}")
+        Errors propagate, so process_single_cv retries the stage instead of
+        recording the CV as recommended.
+        """
+        cv_obj = CV.objects.get(id=cv_id)
+        user = cv_obj.created_by  # Adjust based on CV's user field
+        
+        JobRecommendation.objects.filter(cv=cv_obj).delete()
+        
+        if not self.job_listings or self.job_vectors is None:
+            refresh_user_feeds([cv_obj.created_by_id])
             return []
+        
+        # CV-based similarity
+        cv_text = self._extract_cv_text(cv_obj)
+        cv_vector = self.vectorizer.transform([cv_text])
+        cv_scores = cosine_similarity(cv_vector, self.job_vectors).flatten()
+        
+        # Activity-based similarity
+        activity_scores = self._calculate_activity_scores(user)
+        
+        # Combine scores
+        combined_scores = 0.7 * cv_scores + 0.3 * activity_scores
+        # Popularity breaks ties between similar matches; it cannot make an unrelated job match
+        combined_scores = np.minimum(
+            combined_scores * (1 + settings.JOB_POPULARITY_RECOMMENDATION_WEIGHT * self.popularity_scores), 1.0
+        )
+        recommendations = self._save_recommendations(cv_obj, combined_scores, num_recommendations)
+        refresh_user_feeds([cv_obj.created_by_id])
+        return recommendations
     
     def _extract_cv_text(self, cv_obj):
         """Extract skills and experience from CV"""
@@ -74,14 +142,14 @@ class JobRecommender:
     def _calculate_activity_scores(self, user):
         """Calculate scores based on user's job interactions"""
         activity_scores = np.zeros(len(self.job_listings))
-        activities = JobActivity.objects.filter(user=user)
+        activities = JobActivity.objects.filter(user=user, job__isnull=False)
         
         if activities.exists():
             activity_weights = {'applied': 2.0, 'saved': 1.5, 'viewed': 1.0}
             user_activity_vector = csr_matrix((1, self.job_vectors.shape[1]))
             
             for activity in activities:
-                job_id = activity.job.id
+                job_id = activity.job_id
                 if job_id in self.job_id_to_index:
                     idx = self.job_id_to_index[job_id]
                     weight = activity_weights.get(activity.activity_type, 1.0)
@@ -97,16 +165,17 @@ class JobRecommender:
         recommendations = []
         sorted_indices = scores.argsort()[::-1]
         
-        for i, idx in enumerate(sorted_indices):
-            if i >= num_recommendations:
-                break
+        for idx in sorted_indices[:num_recommendations]:
             score = scores[idx]
             if score < 0.1:
                 continue
-            job = self.job_listings[idx]
-            recommendation = JobRecommendation.objects.create(
-                cv=cv_obj, job=job, match_score=round(score * 100, 1)
-            )
-            recommendations.append(recommendation)
+            recommendations.append(JobRecommendation(
+                cv=cv_obj, job=self.job_listings[idx], match_score=round(score * 100, 1)
+            ))
         
-        return recommendations
\ No newline at end of file
+        # The job matrix can be up to an hour old; skip jobs archived since
+        live_ids = set(Job.objects.filter(
+            id__in=[recommendation.job_id for recommendation in recommendations]
+        ).values_list('id', flat=True))
+        recommendations = [r for r in recommendations if r.job_id in live_ids]
+        return JobRecommendation.objects.bulk_create(recommendations)
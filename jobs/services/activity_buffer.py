@@ -0,0 +1,176 @@
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from redis.exceptions import RedisError
+
+from jobs.models import Job, JobActivity
+from skillsverse_backend.walrus_db import db
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'activity:buffer'
+# Events taken by a flush stay here until they are in the database, so a
+# flush that dies half way is retried instead of losing them
+PROCESSING_KEY = 'activity:processing'
+PROCESSING_OWNER_KEY = 'activity:processing:owner'  # Token of the flush holding the batch
+FLUSH_LOCK_KEY = 'activity:flush:lock'
+
+# Resume an unfinished batch if there is one, otherwise move the oldest
+# ARGV[1] buffered events into the processing list; either way the batch
+# now belongs to the flush with token ARGV[2]
+TAKE_SCRIPT = """
+local batch = redis.call('LRANGE', KEYS[2], 0, -1)
+if #batch == 0 then
+    batch = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+    if #batch > 0 then
+        redis.call('LTRIM', KEYS[1], #batch, -1)
+        redis.call('RPUSH', KEYS[2], unpack(batch))
+    end
+end
+if #batch > 0 then
+    redis.call('SET', KEYS[3], ARGV[2])
+end
+return batch
+"""
+
+# Delete KEYS when KEYS[1] still holds the token ARGV[1]
+COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', unpack(KEYS))
+end
+return 0
+"""
+
+
+class ActivityBuffer:
+    """
+    Write-behind buffer for JobActivity.
+
+    Requests append events to a Redis list and return without touching the
+    database. A periodic flush takes the oldest events in batches, keeps
+    one event per (user, job, activity type), the earliest, and inserts them
+    with a single ``bulk_create`` that skips rows already stored, so a
+    repeat view is dropped rather than raising an IntegrityError.
+
+    Flushes do not overlap: each holds a lock for its whole run, and only
+    clears a batch it still owns, so one that outlives its lock cannot
+    delete the batch the next run has taken over.
+    """
+
+    def __init__(self, redis_db=db):
+        self.db = redis_db
+        self._take = self.db.register_script(TAKE_SCRIPT)
+        self._compare_and_delete = self.db.register_script(COMPARE_AND_DELETE_SCRIPT)
+
+    def push(self, user_id, events):
+        """
+        Buffer a user's events
+
+        Args:
+            user_id (int): User the events belong to
+            events (list): (job_id, activity_type) pairs
+
+        Returns:
+            bool: False when Redis is unavailable and the events were written directly
+        """
+        if not events:
+            return True
+        now = time.time()
+        entries = [json.dumps([user_id, job_id, activity_type, now]) for job_id, activity_type in events]
+        try:
+            self.db.rpush(BUFFER_KEY, *entries)
+            return True
+        except RedisError as e:
+            # Keep the events; the database takes the write as it did before buffering
+            logger.warning(f"Activity buffer unavailable, writing {len(entries)} events directly: {e}")
+            self.write(entries)
+            return False
+
+    def flush(self, batch_size=None, max_batches=None):
+        """
+        Move buffered events into JobActivity
+
+        Args:
+            batch_size (int): Events taken from Redis per database write
+            max_batches (int): Stop after this many batches, leaving the rest for the next run
+
+        Returns:
+            int: Events taken from the buffer
+        """
+        batch_size = batch_size or settings.ACTIVITY_FLUSH_BATCH_SIZE
+        max_batches = max_batches or settings.ACTIVITY_FLUSH_MAX_BATCHES
+        token = uuid.uuid4().hex
+        try:
+            locked = self.db.set(FLUSH_LOCK_KEY, token, nx=True, ex=settings.ACTIVITY_FLUSH_LOCK_TIMEOUT)
+        except RedisError as e:
+            logger.warning(f"Could not read the activity buffer: {e}")
+            return 0
+        if not locked:
+            logger.info("Another activity flush is running; skipping this one")
+            return 0
+
+        taken = 0
+        try:
+            for _ in range(max_batches):
+                entries = self._take(keys=[BUFFER_KEY, PROCESSING_KEY, PROCESSING_OWNER_KEY], args=[batch_size, token])
+                if not entries:
+                    break
+                self.write(entries)
+                if not self._compare_and_delete(keys=[PROCESSING_OWNER_KEY, PROCESSING_KEY], args=[token]):
+                    # Our lock expired and a newer flush took the batch over; it clears it
+                    logger.warning("Activity flush lost its batch to a newer run; stopping")
+                    break
+                taken += len(entries)
+        except RedisError as e:
+            # An unfinished batch is retried next run; ignore_conflicts makes that harmless
+            logger.warning(f"Activity flush interrupted: {e}")
+        finally:
+            try:
+                self._compare_and_delete(keys=[FLUSH_LOCK_KEY], args=[token])
+            except RedisError:
+                pass  # The lock expires on its own
+        return taken
+
+    def write(self, entries):
+        """
+        Insert buffered entries, one row per (user, job, activity type)
+
+        Events for jobs or users deleted since they were recorded, and
+        malformed entries, are dropped.
+
+        Returns:
+            int: Rows submitted; ones already stored are skipped by the database
+        """
+        earliest = {}
+        for entry in entries:
+            try:
+                user_id, job_id, activity_type, recorded_at = json.loads(entry)
+            except (TypeError, ValueError):
+                logger.warning(f"Dropping malformed activity event {entry!r}")
+                continue
+            key = (user_id, job_id, activity_type)
+            if key not in earliest or recorded_at < earliest[key]:
+                earliest[key] = recorded_at
+
+        job_ids = set(Job.objects.filter(id__in={key[1] for key in earliest}).values_list('id', flat=True))
+        user_ids = set(get_user_model().objects.filter(
+            id__in={key[0] for key in earliest}
+        ).values_list('id', flat=True))
+        activities = [
+            JobActivity(
+                user_id=user_id, job_id=job_id, activity_type=activity_type,
+                timestamp=datetime.fromtimestamp(recorded_at, tz=dt_timezone.utc),
+            )
+            for (user_id, job_id, activity_type), recorded_at in earliest.items()
+            if job_id in job_ids and user_id in user_ids
+        ]
+        JobActivity.objects.bulk_create(activities, ignore_conflicts=True)
+        return len(activities)
+
+
+activity_buffer = ActivityBuffer()
@@ -0,0 +1,204 @@
+import logging
+import math
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from skillsverse_backend.walrus_db import db
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first, both in the admission queue and by the broker
+PRIORITY_FIRST_CV = 0
+PRIORITY_REUPLOAD = 1
+CELERY_PRIORITIES = {
+    PRIORITY_FIRST_CV: 0,
+    PRIORITY_REUPLOAD: 5,
+}
+
+QUEUE_KEY = 'cv:admission:queue'
+ENQUEUED_KEY = 'cv:admission:enqueued'
+USER_KEY = 'cv:admission:user:{}'
+OWNER_KEY = 'cv:admission:owner'  # Queue member -> user id, to free the user's slot on eviction
+
+# Scores sort by priority first, then by arrival time
+PRIORITY_SCORE_STEP = 10 ** 10
+
+Admission = namedtuple('Admission', ['admitted', 'ticket', 'position', 'retry_after', 'priority'])
+
+# Stale entries are evicted first, freeing their owners' in-flight slots;
+# an owner's counter key is USER_KEY, built from the prefix in ARGV[7]
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[3])
+local cutoff = now - tonumber(ARGV[6])
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', cutoff)
+for _, member in ipairs(stale) do
+    redis.call('ZREM', KEYS[1], member)
+    local owner = redis.call('HGET', KEYS[4], member)
+    if owner then
+        redis.call('HDEL', KEYS[4], member)
+        local user_key = ARGV[7] .. owner
+        if tonumber(redis.call('GET', user_key) or '0') > 0 then
+            redis.call('DECR', user_key)
+        end
+    end
+end
+if #stale > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', cutoff)
+end
+
+local depth = redis.call('ZCARD', KEYS[1])
+if depth >= tonumber(ARGV[4]) then
+    return {0, depth, 0}
+end
+local inflight = tonumber(redis.call('GET', KEYS[3]) or '0')
+if inflight >= tonumber(ARGV[5]) then
+    return {-1, depth, inflight}
+end
+
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[2], now, ARGV[1])
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[8])
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+return {1, redis.call('ZRANK', KEYS[1], ARGV[1]), inflight + 1}
+"""
+
+BIND_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not score then
+    return -1
+end
+local enqueued = redis.call('ZSCORE', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[1], score, ARGV[2])
+redis.call('ZADD', KEYS[2], enqueued, ARGV[2])
+local owner = redis.call('HGET', KEYS[3], ARGV[1])
+if owner then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+    redis.call('HSET', KEYS[3], ARGV[2], owner)
+end
+return redis.call('ZRANK', KEYS[1], ARGV[2])
+"""
+
+RELEASE_SCRIPT = """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+if removed == 1 and tonumber(redis.call('GET', KEYS[3]) or '0') > 0 then
+    redis.call('DECR', KEYS[3])
+end
+return removed
+"""
+
+
+class CVAdmissionController:
+    """
+    Redis-backed admission control for CV processing.
+
+    Every admitted CV holds a slot in a priority-ordered queue and counts
+    towards its owner's in-flight limit until processing finishes. Uploads
+    arriving while the queue is over budget are turned away with a retry hint
+    instead of growing the backlog. First CVs get a larger budget and are
+    served before re-uploads. Slots never released (a crashed worker) are
+    evicted after CV_ADMISSION_TTL, together with their owner's count.
+    """
+
+    def __init__(self, redis_db=db):
+        self.db = redis_db
+        self._admit = self.db.register_script(ADMIT_SCRIPT)
+        self._bind = self.db.register_script(BIND_SCRIPT)
+        self._release = self.db.register_script(RELEASE_SCRIPT)
+
+    def admit(self, user_id, is_first_cv):
+        """
+        Reserve a processing slot for a new upload
+
+        Args:
+            user_id (int): Owner of the upload
+            is_first_cv (bool): Whether this is the user's first CV
+
+        Returns:
+            Admission: Whether the upload was admitted, its ticket and queue
+            position, or how long to wait before retrying
+        """
+        priority = PRIORITY_FIRST_CV if is_first_cv else PRIORITY_REUPLOAD
+        max_depth = settings.CV_QUEUE_MAX_DEPTH if is_first_cv else settings.CV_QUEUE_REUPLOAD_MAX_DEPTH
+        ticket = f"ticket:{uuid.uuid4().hex}"
+        now = int(time.time())
+
+        try:
+            status, depth, inflight = self._admit(
+                keys=[QUEUE_KEY, ENQUEUED_KEY, USER_KEY.format(user_id), OWNER_KEY],
+                args=[
+                    ticket,
+                    priority * PRIORITY_SCORE_STEP + now,
+                    now,
+                    max_depth,
+                    settings.CV_MAX_INFLIGHT_PER_USER,
+                    settings.CV_ADMISSION_TTL,
+                    USER_KEY.format(''),
+                    user_id,
+                ],
+            )
+        except RedisError as e:
+            # Never block uploads on the admission layer itself
+            logger.warning(f"CV admission unavailable, admitting without a slot: {e}")
+            return Admission(True, None, None, None, priority)
+
+        if status == 1:
+            return Admission(True, ticket, depth, None, priority)
+
+        if status == 0:
+            # Queue is full: wait roughly for the excess to drain
+            backlog = depth - max_depth + 1
+        else:
+            # User is at their in-flight limit: wait for one of theirs to finish
+            backlog = inflight
+        retry_after = max(1, math.ceil(backlog * settings.CV_ADMISSION_SECONDS_PER_CV))
+        return Admission(False, None, None, retry_after, priority)
+
+    def bind(self, ticket, cv_id):
+        """Attach a reserved slot to the CV created for it, keeping its place in line"""
+        if ticket is None:
+            return None
+        try:
+            position = self._bind(keys=[QUEUE_KEY, ENQUEUED_KEY, OWNER_KEY], args=[ticket, cv_id])
+        except RedisError as e:
+            logger.warning(f"Could not bind admission ticket for CV {cv_id}: {e}")
+            return None
+        return None if position < 0 else position
+
+    def release(self, member, user_id):
+        """Free a slot once its CV is done processing (or its upload was abandoned)"""
+        if member is None:
+            return
+        try:
+            self._release(
+                keys=[QUEUE_KEY, ENQUEUED_KEY, USER_KEY.format(user_id), OWNER_KEY],
+                args=[member],
+            )
+        except RedisError as e:
+            logger.warning(f"Could not release admission slot {member}: {e}")
+
+    def position(self, cv_id):
+        """Current queue position of a CV, or None if it is not queued"""
+        try:
+            return self.db.zrank(QUEUE_KEY, cv_id)
+        except RedisError:
+            return None
+
+    def depth(self):
+        """Number of CVs currently admitted and not yet processed"""
+        return self.db.zcard(QUEUE_KEY)
+
+    @staticmethod
+    def celery_priority(priority):
+        return CELERY_PRIORITIES[priority]
+
+
+cv_admission = CVAdmissionController()
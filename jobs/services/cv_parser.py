@@ -7,6 +7,8 @@ from docx import Document
 from pathlib import Path
 from datetime import datetime
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from jobs.models import Skill, CV, CVEducation, CVWorkExperience, CVContactInfo
 
 class CVParser:
@@ -113,50 +115,65 @@ class CVParser:
         return re.compile(pattern, re.IGNORECASE)
     
     def parse_cv(self, cv_id):
-        """Parse a CV and extract information"""
+        """Parse a CV and extract information, resuming from its last completed stage"""
+        cv_obj = None
         try:
             # Get CV object from database
             cv_obj = CV.objects.get(id=cv_id)
             cv_obj.status = 'processing'
-            cv_obj.save()
+            cv_obj.save(update_fields=['status'])
             
-            # Get file path
-            file_path = cv_obj.file.path
+            if not cv_obj.has_reached_stage(CV.STAGE_EXTRACTED):
+                self.extract_stage(cv_obj)
+            if not cv_obj.has_reached_stage(CV.STAGE_ANALYZED):
+                self.analyze_stage(cv_obj)
+            if not cv_obj.has_reached_stage(CV.STAGE_PERSISTED):
+                self.persist_stage(cv_obj)
             
-            # Extract text based on file type
-            ext = cv_obj.get_file_extension()
-            
-            if ext == '.pdf':
-                text = self._extract_from_pdf(file_path)
-            elif ext == '.docx':
-                text = self._extract_from_docx(file_path)
-            elif ext == '.txt':
-                text = self._extract_from_txt(file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {ext}")
-            
-            # Process and extract information
-            parsed_data = self._process_text(text)
-            
-            # Save parsed data to the CV object
-            cv_obj.parsed_data = parsed_data
-            cv_obj.extracted_skills = parsed_data["skills"]
-
             cv_obj.status = 'completed'
-            cv_obj.save()
-            
-            # Save extracted information to related models
-            self._save_extracted_info(cv_obj, parsed_data)
-            
+            cv_obj.save(update_fields=['status'])
             return True
             
         except Exception as e:
             if cv_obj:
                 cv_obj.status = 'failed'
-                cv_obj.save()
+                cv_obj.save(update_fields=['status'])
             print(f"Error parsing CV: {str(e)}")
             return False
     
+    def extract_stage(self, cv_obj):
+        """Stage 1: read the uploaded file and store its raw text"""
+        text = self.extract_text(cv_obj)
+        cv_obj.mark_stage(CV.STAGE_EXTRACTED, extracted_text=text)
+    
+    def analyze_stage(self, cv_obj):
+        """Stage 2: run NLP over the stored text and store the structured result"""
+        parsed_data = self._process_text(cv_obj.extracted_text or "")
+        cv_obj.mark_stage(CV.STAGE_ANALYZED, parsed_data=parsed_data)
+    
+    def persist_stage(self, cv_obj):
+        """Stage 3: write the structured result to the related models"""
+        with transaction.atomic():
+            self._save_extracted_info(cv_obj, cv_obj.parsed_data or {})
+            cv_obj.mark_stage(
+                CV.STAGE_PERSISTED,
+                is_parsed=True,
+                parsed_at=timezone.now(),
+            )
+    
+    def extract_text(self, cv_obj):
+        """Extract raw text from the CV file based on its type"""
+        file_path = cv_obj.file.path
+        ext = cv_obj.get_file_extension()
+        
+        if ext == '.pdf':
+            return self._extract_from_pdf(file_path)
+        elif ext == '.docx':
+            return self._extract_from_docx(file_path)
+        elif ext == '.txt':
+            return self._extract_from_txt(file_path)
+        raise ValueError(f"Unsupported file format: {ext}")
+    
     def _extract_from_pdf(self, file_path):
         """Extract text from PDF file"""
         text = ""
@@ -351,44 +368,61 @@ class CVParser:
         return contact_info
     
     def _save_extracted_info(self, cv_obj, parsed_data):
-        """Save extracted information to related models"""
+        """
+        Save extracted information to related models.
+        
+        Safe to run more than once for the same CV: previously saved rows
+        are replaced rather than duplicated.
+        """
         # Save skills
+        skills = []
         for skill_name in parsed_data.get('skills', []):
             try:
                 skill, _ = Skill.objects.get_or_create(
                     name=skill_name,
                     defaults={'category': 'uncategorized'}
                 )
-                cv_obj.extracted_skills.add(skill)
+                skills.append(skill)
             except Exception as e:
                 print(f"Error saving skill {skill_name}: {str(e)}")
+        cv_obj.extracted_skills.set(skills)
         
         # Save education
-        for edu in parsed_data.get('education', []):
-            if edu.get('institution'):
-                CVEducation.objects.create(
-                    cv=cv_obj,
-                    institution=edu.get('institution', ''),
-                    degree=edu.get('degree', ''),
-                    years=edu.get('years', '')
-                )
+        CVEducation.objects.filter(cv=cv_obj).delete()
+        CVEducation.objects.bulk_create([
+            CVEducation(
+                cv=cv_obj,
+                institution=edu.get('institution', ''),
+                degree=edu.get('degree', ''),
+                years=edu.get('years', '')
+            )
+            for edu in parsed_data.get('education', [])
+            if edu.get('institution')
+        ])
         
         # Save work experience
-        for exp in parsed_data.get('work_experience', []):
-            if exp.get('company') or exp.get('title'):
-                CVWorkExperience.objects.create(
-                    cv=cv_obj,
-                    company=exp.get('company', ''),
-                    title=exp.get('title', ''),
-                    duration=exp.get('duration', ''),
-                    description=exp.get('description', '')
-                )
+        CVWorkExperience.objects.filter(cv=cv_obj).delete()
+        CVWorkExperience.objects.bulk_create([
+            CVWorkExperience(
+                cv=cv_obj,
+                company=exp.get('company', ''),
+                title=exp.get('title', ''),
+                duration=exp.get('duration', ''),
+                description=exp.get('description', '')
+            )
+            for exp in parsed_data.get('work_experience', [])
+            if exp.get('company') or exp.get('title')
+        ])
         
         # Save contact info
         contact = parsed_data.get('contact_info', {})
         if contact.get('email') or contact.get('phone'):
-            CVContactInfo.objects.create(
+            CVContactInfo.objects.update_or_create(
                 cv=cv_obj,
-                email=contact.get('email', ''),
-                phone=contact.get('phone', '')
-            )
\ No newline at end of file
+                defaults={
+                    'email': contact.get('email', ''),
+                    'phone': contact.get('phone', ''),
+                }
+            )
+        else:
+            CVContactInfo.objects.filter(cv=cv_obj).delete()
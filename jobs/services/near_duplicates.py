@@ -0,0 +1,158 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+from jobs.models import Job, JobLSHBucket
+
+# 64 hash functions split into 16 bands of 4 rows: postings whose
+# signatures agree on a whole band become candidates. With this banding a
+# pair with Jaccard similarity 0.8 is caught with probability ~0.99, while
+# pairs below 0.3 almost never are.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5  # words
+SIMILARITY_THRESHOLD = 0.8
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; products
+# stay below 2**64 so the arithmetic is exact in uint64
+_PRIME = np.uint64(4294967291)
+_rng = np.random.RandomState(20250401)
+_A = _rng.randint(1, 2 ** 32 - 5, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 5, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text):
+    """Hashes of the overlapping word n-grams of a plain text"""
+    words = _WORD.findall((text or "").lower())
+    if not words:
+        return set()
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text):
+    """MinHash signature as NUM_PERMUTATIONS uint32 values, or None for empty text"""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    permuted = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket id per band, salted with the band number"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def estimated_similarity(signature, other):
+    """Fraction of agreeing MinHash values, an unbiased estimate of Jaccard similarity"""
+    return float(np.mean(signature == other))
+
+
+def _job_text(job):
+    return f"{job.title} {job.description_text}"
+
+
+class NearDuplicateIndex:
+    """
+    Clusters near-duplicate postings under one canonical Job.
+
+    Each job's MinHash signature is banded into LSH buckets stored in an
+    indexed table, so the candidates for a new posting are found with one
+    indexed lookup instead of comparing it against every stored job. A
+    candidate whose estimated similarity clears the threshold becomes the
+    posting's canonical job; listings and recommendations only show
+    canonical postings.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+
+    def index_jobs(self, jobs):
+        """
+        Sign, bucket and cluster a batch of saved jobs
+
+        Args:
+            jobs (list): Saved Job instances; previously indexed ones are re-indexed
+
+        Returns:
+            int: Number of jobs marked as duplicates of another posting
+        """
+        jobs = [job for job in jobs if job.pk]
+        if not jobs:
+            return 0
+
+        signatures = {}
+        buckets = {}
+        for job in jobs:
+            signature = minhash_signature(_job_text(job))
+            if signature is not None:
+                signatures[job.pk] = signature
+                buckets[job.pk] = band_buckets(signature)
+
+        # Refreshed postings are re-bucketed from scratch
+        JobLSHBucket.objects.filter(job_id__in=[job.pk for job in jobs]).delete()
+
+        # Stored jobs sharing any bucket with this batch, in one indexed query
+        all_buckets = {bucket for job_buckets in buckets.values() for bucket in job_buckets}
+        jobs_by_bucket = {}
+        for bucket, job_id in JobLSHBucket.objects.filter(bucket__in=all_buckets).values_list("bucket", "job_id"):
+            jobs_by_bucket.setdefault(bucket, set()).add(job_id)
+        stored_ids = set().union(*jobs_by_bucket.values()) if jobs_by_bucket else set()
+        stored = {
+            job_id: (np.frombuffer(bytes(minhash), dtype=np.uint32), canonical_id)
+            for job_id, minhash, canonical_id in Job.objects.filter(
+                id__in=stored_ids, minhash__isnull=False
+            ).values_list("id", "minhash", "canonical_id")
+        }
+
+        duplicates = 0
+        new_buckets = []
+        for job in jobs:
+            signature = signatures.get(job.pk)
+            job.minhash = signature.tobytes() if signature is not None else None
+            job.canonical_id = None
+            if signature is None:
+                continue
+
+            candidates = set()
+            for bucket in buckets[job.pk]:
+                candidates |= jobs_by_bucket.get(bucket, set())
+            candidates.discard(job.pk)
+
+            best_id, best_similarity = None, self.threshold
+            for candidate_id in sorted(candidates):
+                candidate_signature, candidate_canonical = stored[candidate_id]
+                similarity = estimated_similarity(signature, candidate_signature)
+                if similarity >= best_similarity:
+                    # Point at the cluster's root, not at another duplicate
+                    best_id = candidate_canonical or candidate_id
+                    best_similarity = similarity
+            if best_id is not None and best_id != job.pk:
+                job.canonical_id = best_id
+                duplicates += 1
+
+            # Later jobs in this batch can match this one
+            stored[job.pk] = (signature, job.canonical_id)
+            for bucket in buckets[job.pk]:
+                jobs_by_bucket.setdefault(bucket, set()).add(job.pk)
+                new_buckets.append(JobLSHBucket(job_id=job.pk, bucket=bucket))
+
+        Job.objects.bulk_update(jobs, ["minhash", "canonical"])
+        JobLSHBucket.objects.bulk_create(new_buckets)
+        return duplicates
@@ -0,0 +1,79 @@
+import re
+
+from django.db import transaction
+
+from jobs.models import Job, Skill
+
+# Skill names seeded by the CV parser are regex fragments ("C\+\+", "ASP\.NET")
+_ESCAPE = re.compile(r"\\(.)")
+
+
+def _plain_name(name):
+    return _ESCAPE.sub(r"\1", name).strip()
+
+
+class SkillMatcher:
+    """
+    Finds known skills in free text.
+
+    The Skill table is read once and compiled into a single alternation, so
+    matching a whole batch of postings costs no queries. Names are matched
+    literally and case-insensitively on word boundaries; "C++" and "C#" work
+    because the boundaries are lookarounds rather than ``\\b``.
+    """
+
+    def __init__(self, skills=None):
+        skills = Skill.objects.order_by("id") if skills is None else skills
+        # Lowercased name -> Skill id; the oldest row wins for names that
+        # only differ in case or escaping
+        self.skill_ids = {}
+        for skill in skills:
+            key = _plain_name(skill.name).lower()
+            if key:
+                self.skill_ids.setdefault(key, skill.id)
+
+        self.pattern = None
+        if self.skill_ids:
+            # Longest first so "Machine Learning" wins over "Machine"
+            names = sorted(self.skill_ids, key=len, reverse=True)
+            self.pattern = re.compile(
+                r"(?<!\w)(?:" + "|".join(re.escape(name) for name in names) + r")(?!\w)",
+                re.IGNORECASE,
+            )
+
+    def match(self, text):
+        """Return the ids of the skills mentioned in the text"""
+        if self.pattern is None or not text:
+            return set()
+        found = {match.group(0).lower() for match in self.pattern.finditer(text)}
+        return {self.skill_ids[name] for name in found if name in self.skill_ids}
+
+    def match_job(self, job):
+        """Return the ids of the skills mentioned in a job's title, description or tags"""
+        tags = " ".join(str(tag) for tag in job.tags or [])
+        return self.match(f"{job.title}\n{job.description_text}\n{tags}")
+
+    def assign_skills(self, jobs):
+        """
+        Replace the skills of saved jobs with the ones found in their text
+
+        The through table is written with one delete and one bulk insert for
+        the whole batch instead of a ``skills.set()`` per job.
+
+        Returns:
+            int: Number of job-skill links written
+        """
+        jobs = [job for job in jobs if job.pk]
+        if not jobs:
+            return 0
+
+        through = Job.skills.through
+        links = [
+            through(job_id=job.pk, skill_id=skill_id)
+            for job in jobs
+            for skill_id in self.match_job(job)
+        ]
+        with transaction.atomic():
+            through.objects.filter(job_id__in=[job.pk for job in jobs]).delete()
+            through.objects.bulk_create(links, ignore_conflicts=True)
+        return len(links)
@@ -1,7 +1,13 @@
 from django_celery_beat.models import PeriodicTask, IntervalSchedule
-from django.db import OperationalError
+from django.db import OperationalError, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 import json
 
+from .feed import refresh_user_feeds
+from .list_cache import bump_generation
+from .models import CV, Job
+
 def setup_job_fetch_task():
     try:
         schedule, _ = IntervalSchedule.objects.get_or_create(
@@ -18,3 +24,15 @@ def setup_job_fetch_task():
     except OperationalError:
         # Database tables don't exist yet, skip setup
         pass
+
+
+@receiver(post_save, sender=Job)
+def invalidate_job_list(sender, **kwargs):
+    # Bulk writes bypass this; they call bump_generation() themselves
+    bump_generation()
+
+
+@receiver(post_delete, sender=CV)
+def drop_cv_recommendations_from_feed(sender, instance, **kwargs):
+    # The CV's recommendations were deleted with it
+    transaction.on_commit(lambda: refresh_user_feeds([instance.created_by_id]))
@@ -0,0 +1,74 @@
+import threading
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+from .models import Job
+
+# Leaves room for a "-<counter>" suffix within Job.slug's max_length
+MAX_BASE_LENGTH = 240
+
+# Fixed path segments of jobs/urls.py that precede the <slug:slug>/ detail
+# route; a job given one of these as its slug could never be served
+RESERVED_SLUGS = frozenset({'create', 'bulk', 'search', 'activity', 'recommended', 'matches', 'cv'})
+
+
+def base_slug(title):
+    """Slug a title would get before any de-duplicating suffix."""
+    if not title or title == "Untitled":
+        title = "job-posting-" + get_random_string(8)
+    slug = slugify(title)[:MAX_BASE_LENGTH].strip("-")
+    # Titles with no ASCII letters or digits slugify to nothing
+    return slug or "job-posting-" + get_random_string(8).lower()
+
+
+class SlugAllocator:
+    """
+    Allocates unique Job slugs for many titles at once.
+
+    Existing slugs sharing the batch's base prefixes are fetched in a single
+    query and suffixes are assigned in memory, instead of probing the table
+    once per candidate slug. Slugs handed out are remembered, so one
+    allocator can be shared by every batch (and thread) of an ingest run.
+    RESERVED_SLUGS are never handed out; those titles get a suffix.
+    """
+
+    def __init__(self):
+        self._taken = set(RESERVED_SLUGS)
+        self._next_suffix = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, titles):
+        """
+        Return one unique slug per title, in order
+
+        Args:
+            titles (list): Job titles to allocate slugs for
+
+        Returns:
+            list: Slugs, none of which exist in the table or were handed out before
+        """
+        bases = [base_slug(title) for title in titles]
+        if not bases:
+            return []
+
+        with self._lock:
+            unseen = {base for base in bases if base not in self._next_suffix}
+            if unseen:
+                prefixes = reduce(or_, (Q(slug__startswith=base) for base in unseen))
+                self._taken.update(Job.objects.filter(prefixes).values_list("slug", flat=True))
+                for base in unseen:
+                    self._next_suffix[base] = 1
+
+            slugs = []
+            for base in bases:
+                slug = base
+                while slug in self._taken:
+                    slug = f"{base}-{self._next_suffix[base]}"
+                    self._next_suffix[base] += 1
+                self._taken.add(slug)
+                slugs.append(slug)
+            return slugs
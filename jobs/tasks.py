@@ -1,139 +1,200 @@
 # jobs/tasks.py
 from celery import shared_task
 from .job_fetcher import fetch_jobs_task
+from . import archive, popularity, recommender_index, uploads
 
 
 import logging
+import time
+from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.conf import settings
 
 # Celery imports
-from celery import shared_task, group
-from celery.result import ResultSet
+from celery import shared_task
 
 # Django models
 from jobs.models import CV, JobRecommendation
-from django.db.models import Q
+from jobs.feed import refresh_user_feeds
+from django.db.models import Min
+from django.db.models.functions import Coalesce
 
 # Imported services
 from jobs.services.cv_parser import CVParser
 print("I have gotten the CVParser", CVParser)
 from jobs.services.Job_recommender import JobRecommender
+from jobs.services.admission import cv_admission
+from jobs.services.activity_buffer import activity_buffer
 
 # Logging setup
 logger = logging.getLogger(__name__)
 
+# Parser and recommender are expensive to build (spaCy model, TF-IDF matrix),
+# so each worker process keeps one of each
+RECOMMENDER_MAX_AGE_SECONDS = 3600
+_cv_parser = None
+_job_recommender = None
+_job_recommender_built_at = 0
+_job_recommender_version = None  # Last recommender_index version applied
+
+
+def get_cv_parser():
+    global _cv_parser
+    if _cv_parser is None:
+        _cv_parser = CVParser()
+    return _cv_parser
+
+
+def get_job_recommender():
+    """
+    This worker's recommender, with the jobs other workers have logged since
+    it was built (see jobs.recommender_index)
+    """
+    global _job_recommender, _job_recommender_built_at, _job_recommender_version
+    now = time.monotonic()
+    rebuild = _job_recommender is None or now - _job_recommender_built_at > RECOMMENDER_MAX_AGE_SECONDS
+    if not rebuild:
+        update = recommender_index.jobs_since(_job_recommender_version)
+        # None: Redis is down, so keep the index as it is
+        if update is not None:
+            version, job_ids = update
+            if job_ids is None:
+                rebuild = True
+            else:
+                if job_ids:
+                    _job_recommender.add_jobs(job_ids)
+                _job_recommender_version = version
+    if rebuild:
+        # Read first: jobs logged during the build are added again, which add_jobs skips
+        _job_recommender_version = recommender_index.current_version()
+        _job_recommender = JobRecommender()
+        _job_recommender_built_at = now
+    return _job_recommender
+
+
+@shared_task(bind=True, max_retries=3)
+def process_single_cv(self, cv_id):
+    """
+    Process a single CV for parsing and job recommendations
+    
+    Each stage records its result on the CV before the next one starts,
+    so a retry picks up at the stage that failed instead of starting over.
+    
+    Args:
+        cv_id (int): ID of the CV to process
+    
+    Returns:
+        bool: Processing success status
+    """
+    try:
+        cv = CV.objects.get(id=cv_id)
+    except CV.DoesNotExist:
+        logger.error(f"CV {cv_id} does not exist")
+        return False
+    
+    # Prevent reprocessing
+    if cv.has_reached_stage(CV.STAGE_RECOMMENDED):
+        logger.info(f"CV {cv_id} already processed. Skipping.")
+        return False
+    
+    try:
+        cv.status = 'processing'
+        cv.save(update_fields=['status'])
+        
+        cv_parser = get_cv_parser()
+        if not cv.has_reached_stage(CV.STAGE_EXTRACTED):
+            cv_parser.extract_stage(cv)
+        if not cv.has_reached_stage(CV.STAGE_ANALYZED):
+            cv_parser.analyze_stage(cv)
+        if not cv.has_reached_stage(CV.STAGE_PERSISTED):
+            cv_parser.persist_stage(cv)
+        
+        # Generate job recommendations
+        recommendations = get_job_recommender().recommend_jobs_for_cv(cv_id)
+        cv.mark_stage(CV.STAGE_RECOMMENDED, status='completed')
+        cv_admission.release(cv.id, cv.created_by_id)
+        
+        logger.info(f"Processed CV {cv_id}: {len(recommendations)} job recommendations generated")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error processing CV {cv_id} at stage '{cv.processing_stage}': {str(e)}")
+        if self.request.retries >= self.max_retries:
+            cv.status = 'failed'
+            cv.save(update_fields=['status'])
+            cv_admission.release(cv.id, cv.created_by_id)
+            return False
+        # Retry resumes after the last recorded stage
+        raise self.retry(exc=e)
+
+
 class CVProcessingManager:
     """
     Manages CV processing and job recommendation at scale
     """
-    def __init__(self):
-        self.cv_parser = CVParser()
-        self.job_recommender = JobRecommender()
-    
     def process_unprocessed_cvs(self, batch_size=100):
         """
-        Process CVs in batches with scalability in mind
+        Re-queue CVs whose processing stalled
+        
+        A pending or processing CV is left alone while it uploaded or
+        completed a stage within CV_ADMISSION_TTL, since its task may still
+        be queued or running, and failed CVs have used up their retries. The
+        rest go through admission like a new upload, so the sweep keeps to
+        the queue budget and serves first CVs first.
         
         Args:
-            batch_size (int): Number of CVs to process in one batch
+            batch_size (int): Most CVs to look at in one sweep
         
         Returns:
             dict: Processing statistics
         """
-        # Find unprocessed CVs
-        
-        unprocessed_cvs = CV.objects.filter(
-            Q(is_parsed=False) | 
-            Q(parsed_at__isnull=True)
-        ).order_by('created_at')[:batch_size]
+        cutoff = timezone.now() - timedelta(seconds=settings.CV_ADMISSION_TTL)
+        stuck_cvs = list(
+            CV.objects.exclude(processing_stage=CV.STAGE_RECOMMENDED)
+            .exclude(status='failed')
+            .annotate(last_progress=Coalesce('stage_updated_at', 'uploaded_at'))
+            .exclude(status__in=('pending', 'processing'), last_progress__gt=cutoff)
+            .order_by('uploaded_at')
+            .values_list('id', 'created_by_id')[:batch_size]
+        )
+        first_cv_ids = set(
+            CV.objects.filter(created_by_id__in={user_id for _, user_id in stuck_cvs})
+            .values('created_by_id').annotate(first_id=Min('id')).values_list('first_id', flat=True)
+        )
         
-        # Prepare batch processing
-        cv_processing_tasks = []
-        
-        for cv in unprocessed_cvs:
-            # Create async task for each CV
-            task = self.process_single_cv.delay(cv.id)
-            cv_processing_tasks.append(task)
-        
-        # Wait for all tasks to complete
-        results = ResultSet(cv_processing_tasks)
-        results.join()
-        
-        # Compile processing statistics
         stats = {
-            'total_cvs_processed': len(unprocessed_cvs),
-            'successful_parsing': 0,
-            'failed_parsing': 0
+            'stuck_cvs': len(stuck_cvs),
+            'requeued': 0,
+            'deferred': 0,
         }
-        
-        for task_result in results:
-            if task_result:
-                stats['successful_parsing'] += 1
-            else:
-                stats['failed_parsing'] += 1
-        
+        for cv_id, user_id in stuck_cvs:
+            admission = cv_admission.admit(user_id, cv_id in first_cv_ids)
+            if not admission.admitted:
+                # Over budget; the next sweep tries again
+                stats['deferred'] += 1
+                continue
+            cv_admission.bind(admission.ticket, cv_id)
+            process_single_cv.apply_async((cv_id,), priority=cv_admission.celery_priority(admission.priority))
+            stats['requeued'] += 1
         return stats
-    
-    @shared_task(bind=True, max_retries=3)
-    def process_single_cv(self, cv_id):
-        """
-        Process a single CV for parsing and job recommendations
-        
-        Args:
-            cv_id (int): ID of the CV to process
-        
-        Returns:
-            bool: Processing success status
-        """
-        try:
-            # Retrieve CV
-            cv = CV.objects.get(id=cv_id)
-            
-            # Prevent reprocessing
-            if cv.is_parsed:
-                logger.info(f"CV {cv_id} already parsed. Skipping.")
-                return False
-            
-            # Parse CV
-            parsing_success = self.cv_parser.parse_cv(cv_id)
-            
-            if parsing_success:
-                # Update CV status
-                cv.is_parsed = True
-                cv.parsed_at = timezone.now()
-                cv.save()
-                
-                # Generate job recommendations
-                recommendations = self.job_recommender.recommend_jobs_for_cv(cv_id)
-                
-                logger.info(f"Processed CV {cv_id}: {len(recommendations)} job recommendations generated")
-                return True
-            else:
-                logger.error(f"Failed to parse CV {cv_id}")
-                return False
-        
-        except Exception as e:
-            logger.error(f"Error processing CV {cv_id}: {str(e)}")
-            # Retry mechanism
-            self.process_single_cv.retry(exc=e)
-            return False
 
 
 # Periodic Task Configuration for Celery
 @shared_task
 def scheduled_cv_processing():
     """
-    Scheduled task to process CVs periodically
+    Scheduled task re-queueing CVs whose processing stalled
     """
     processing_manager = CVProcessingManager()
     stats = processing_manager.process_unprocessed_cvs()
     
-    # Optional: Send admin notification or log results
-    if stats['failed_parsing'] > 0:
-        # Send alert or log to monitoring system
-        logger.warning(f"CV Processing Alert: {stats['failed_parsing']} CVs failed processing")
+    if stats['stuck_cvs']:
+        logger.warning(
+            f"CV processing sweep: {stats['stuck_cvs']} stalled CVs, "
+            f"{stats['requeued']} re-queued, {stats['deferred']} deferred by admission"
+        )
+    return stats
 
 
 # Scalability Optimizations for Large Datasets
@@ -158,10 +219,70 @@ class ScalabilityOptimizer:
                 # Keep top N recommendations
                 to_delete = recommendations.order_by('match_score')[:recommendations.count() - max_recommendations]
                 to_delete.delete()
+        
+        refresh_user_feeds(CV.objects.exclude(created_by=None).values_list('created_by_id', flat=True).distinct())
     
 
 @shared_task
 def fetch_jobs_tasks():
     return fetch_jobs_task()
- 
 
+
+@shared_task
+def index_new_jobs(job_ids):
+    """
+    Add jobs created through the API to the recommender index without rebuilding it
+    
+    The jobs are logged in Redis, so every worker adds them to its own
+    index before its next recommendation; this one does so straight away.
+    """
+    recommender_index.publish(job_ids)
+    # Catching up applies the log; add_jobs skips those and covers Redis being down
+    get_job_recommender().add_jobs(job_ids)
+    logger.info(f"Indexed {len(job_ids)} new jobs for the recommender")
+    return len(job_ids)
+
+
+@shared_task
+def flush_job_activity():
+    """
+    Scheduled task moving buffered job activity events into JobActivity
+    """
+    flushed_count = activity_buffer.flush()
+    if flushed_count:
+        logger.info(f"Flushed {flushed_count} job activity events")
+    return flushed_count
+
+
+@shared_task
+def roll_up_job_stats():
+    """
+    Scheduled task copying the Redis job counters into JobDailyStats and rescoring popularity
+    
+    Yesterday is rolled up again so its last hour before midnight is kept.
+    """
+    today = timezone.localdate()
+    row_count = sum(popularity.rollup_daily_stats(day) for day in (today - timedelta(days=1), today))
+    scored_count = popularity.refresh_popularity(today)
+    logger.info(f"Rolled up {row_count} job daily stats, scored {scored_count} jobs")
+    return row_count
+
+
+@shared_task
+def archive_expired_jobs():
+    """
+    Scheduled task moving jobs past JOB_EXPIRY_DAYS out of the hot Job table
+    """
+    archived_count = archive.archive_expired_jobs()
+    logger.info(f"Archived {archived_count} expired jobs")
+    return archived_count
+
+
+@shared_task
+def expire_stale_cv_uploads():
+    """
+    Scheduled task discarding resumable CV uploads abandoned for CV_UPLOAD_EXPIRY_HOURS
+    """
+    expired_count = uploads.expire_stale_uploads()
+    logger.info(f"Discarded {expired_count} abandoned CV uploads")
+    return expired_count
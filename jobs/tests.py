@@ -1,3 +1,83 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from users.models import User
+
+from .models import CV, CVContactInfo, CVEducation, CVWorkExperience, Job, JobRecommendation, Skill
+
+
+class CVEndpointQueryBudgetTests(TestCase):
+    """
+    The CV endpoints serialize every nested relation with a fixed number of
+    queries, however many skills, entries and recommendations a CV has
+    """
+    # Session + user lookups are not counted: the client is force-authenticated
+    DETAIL_QUERIES = 6  # CVs + contact info, then one per prefetch
+    LIST_QUERIES = 7  # As detail, plus the page count
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(wallet_address='0xcv-owner', user_type='job_seeker')
+        cls.employer = User.objects.create_user(wallet_address='0xemployer', user_type='organization')
+        cls.skills = Skill.objects.bulk_create(
+            Skill(name=f'skill-{i}', category='technical') for i in range(12)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_cv(self, size):
+        """A CV with ``size`` of everything CVSerializer nests"""
+        cv = CV.objects.create(created_by=self.user, file='cvs/test.pdf', original_filename='cv.pdf')
+        cv.extracted_skills.set(self.skills[:size])
+        CVContactInfo.objects.create(cv=cv, email='owner@example.com', phone='123')
+        CVEducation.objects.bulk_create(
+            CVEducation(cv=cv, institution=f'University {i}', degree='BSc') for i in range(size)
+        )
+        CVWorkExperience.objects.bulk_create(
+            CVWorkExperience(cv=cv, company=f'Company {i}', title='Engineer') for i in range(size)
+        )
+        for i in range(size):
+            job = Job.objects.create(
+                title=f'Job {cv.pk}-{i}', description='<p>Build things</p>', company_name='Acme',
+                created_by=self.employer,
+            )
+            job.skills.set(self.skills[:size])
+            JobRecommendation.objects.create(cv=cv, job=job, match_score=0.5 + i / 100)
+        return cv
+
+    def test_detail_query_count_is_fixed(self):
+        for size in (1, 10):
+            cv = self.make_cv(size)
+            with self.assertNumQueries(self.DETAIL_QUERIES):
+                response = self.client.get(reverse('cv-detail', args=[cv.pk]))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['skills']), size)
+            self.assertEqual(len(response.data['education']), size)
+            self.assertEqual(len(response.data['work_experience']), size)
+            self.assertEqual(response.data['contact_info']['email'], 'owner@example.com')
+            self.assertEqual(len(response.data['recommendations']), size)
+            self.assertEqual(len(response.data['recommendations'][0]['job']['skills']), size)
+
+    def test_list_query_count_is_fixed(self):
+        self.make_cv(1)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse('cv-list'))
+        self.assertEqual(response.data['count'], 1)
+
+        for _ in range(3):
+            self.make_cv(10)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse('cv-list'))
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(
+            [len(cv['recommendations']) for cv in response.data['results']], [10, 10, 10, 1]
+        )
+
+    def test_other_users_cvs_are_hidden(self):
+        cv = self.make_cv(1)
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(self.client.get(reverse('cv-detail', args=[cv.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('cv-list')).data['count'], 0)
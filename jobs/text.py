@@ -0,0 +1,68 @@
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+# Longest list-view summary, in characters
+SUMMARY_LENGTH = 280
+
+# Elements whose boundaries separate lines of text
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "footer",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "ol", "p", "pre",
+    "section", "table", "td", "th", "tr", "ul",
+}
+# Elements whose content is never text
+SKIPPED_TAGS = {"script", "style", "head", "template"}
+
+_SPACES = re.compile(r"[^\S\n]+")
+_NEWLINES = re.compile(r"\s*\n\s*")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """
+    Plain text of an HTML fragment.
+
+    Tags, scripts and styles are dropped, entities decoded (including ones
+    feeds double-escape, like ``&amp;amp;``) and whitespace collapsed, with
+    one line per block element.
+    """
+    if not html:
+        return ""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    text = unescape("".join(extractor.parts)).replace("\xa0", " ")
+    text = _SPACES.sub(" ", text)
+    return _NEWLINES.sub("\n", text).strip()
+
+
+def summarize(text, length=SUMMARY_LENGTH):
+    """First ``length`` characters of text on one line, cut at a word boundary"""
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1].rsplit(" ", 1)[0] or text[:length - 1]
+    return cut.rstrip(" ,.;:-") + "…"
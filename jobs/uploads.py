@@ -0,0 +1,210 @@
+"""
+Resumable CV uploads.
+
+A client opens an upload session with the file's name and size, then sends
+the bytes in any number of PATCH requests of at most CV_UPLOAD_MAX_CHUNK_SIZE,
+each starting at the offset the server has recorded (tus-style
+``Upload-Offset`` headers). Uploads resume at chunk granularity: under ASGI,
+Django reads a whole request body before the view runs, so a chunk is
+written in full or, when the client disconnects, not at all. The chunk
+limit keeps that body in memory, below FILE_UPLOAD_MAX_MEMORY_SIZE, and each
+chunk is copied into the file's final location under MEDIA_ROOT a
+fixed-size buffer at a time, so the whole file is never held in memory.
+
+While the bytes arrive the file type is sniffed from its first bytes and
+the content hash is built incrementally. The hash is a SHA-256 over the
+SHA-256 digests of consecutive HASH_BLOCK_SIZE blocks: the digests of
+completed blocks are stored on the session, so a chunk landing on any
+worker resumes the hash by re-reading at most one partial block.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import CVUpload
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+READ_SIZE = 64 * 1024
+SNIFF_SIZE = 2048  # Bytes inspected to recognise the file type
+
+# Leading bytes each accepted extension must start with, and the type recorded for it
+FILE_SIGNATURES = {
+    '.pdf': (b'%PDF-', 'application/pdf'),
+    # DOCX files are ZIP containers
+    '.docx': (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    '.txt': (None, 'text/plain'),
+}
+CV_FILE_EXTENSIONS = tuple(FILE_SIGNATURES)
+
+
+class UploadConflict(Exception):
+    """Another request is writing to the same upload, or wrote first"""
+
+
+def sniff_content_type(head, extension):
+    """
+    Content type of a file starting with ``head``, or None when the bytes
+    do not match what its extension promises
+    """
+    if extension not in FILE_SIGNATURES:
+        return None
+    signature, content_type = FILE_SIGNATURES[extension]
+    if signature is not None:
+        return content_type if head.startswith(signature) else None
+    # Plain text: no NUL bytes, and valid UTF-8 apart from a character cut off at the end
+    if b'\x00' in head:
+        return None
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 3:
+            return None
+    return content_type
+
+
+class BlockHasher:
+    """Content hash over fixed blocks whose state can be stored between requests"""
+
+    def __init__(self, block_digests=b'', tail=b''):
+        self.block_digests = bytearray(block_digests)
+        self._tail = hashlib.sha256(tail)
+        self._tail_size = len(tail)
+
+    def update(self, data):
+        view = memoryview(data)
+        while view:
+            take = min(len(view), HASH_BLOCK_SIZE - self._tail_size)
+            self._tail.update(view[:take])
+            self._tail_size += take
+            view = view[take:]
+            if self._tail_size == HASH_BLOCK_SIZE:
+                self.block_digests += self._tail.digest()
+                self._tail = hashlib.sha256()
+                self._tail_size = 0
+
+    def hexdigest(self):
+        final = hashlib.sha256(self.block_digests)
+        if self._tail_size:
+            final.update(self._tail.digest())
+        return final.hexdigest()
+
+
+def content_hash(fileobj):
+    """Content hash of a whole file, e.g. a form upload, as stored in CV.content_hash"""
+    hasher = BlockHasher()
+    for chunk in iter(lambda: fileobj.read(READ_SIZE), b''):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def start_upload(user, filename, size):
+    """Open an upload session and create its empty file at its final location"""
+    name = default_storage.generate_filename(CVUpload.file_name_for(filename))
+    path = default_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'xb').close()
+    return CVUpload.objects.create(
+        created_by=user, original_filename=filename, file_name=name, size=size,
+    )
+
+
+@contextmanager
+def _locked_file(path):
+    with open(path, 'r+b') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadConflict()
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_chunk(upload, stream, length, offset):
+    """
+    Write ``length`` bytes read from ``stream`` at ``offset``, which must be
+    the upload's current offset
+
+    The file is locked for the duration, so a retried chunk racing the
+    original cannot interleave with it. The offset only ever covers bytes
+    on disk: if ``stream`` ends early, only what was read is kept.
+
+    Raises:
+        UploadConflict: Another request holds the upload, or already moved its offset
+
+    Returns:
+        int: Bytes written
+    """
+    path = default_storage.path(upload.file_name)
+    with _locked_file(path) as f:
+        upload.refresh_from_db(fields=['offset', 'block_digests'])
+        if upload.offset != offset:
+            raise UploadConflict()
+        # Resume the hash: completed blocks are stored, the partial one is re-read
+        tail_start = offset - offset % HASH_BLOCK_SIZE
+        f.seek(tail_start)
+        hasher = BlockHasher(upload.block_digests, f.read(offset - tail_start))
+        f.seek(offset)
+        f.truncate()
+
+        written = 0
+        while written < length:
+            try:
+                data = stream.read(min(READ_SIZE, length - written))
+            except OSError as e:
+                logger.info(f"Upload {upload.pk} interrupted at {offset + written} bytes: {e}")
+                break
+            if not data:
+                break
+            f.write(data)
+            hasher.update(data)
+            written += len(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+        upload.offset = offset + written
+        upload.block_digests = bytes(hasher.block_digests)
+        update_fields = ['offset', 'block_digests', 'updated_at']
+        if upload.is_complete:
+            upload.content_hash = hasher.hexdigest()
+            update_fields.append('content_hash')
+        if not upload.content_type and upload.offset >= min(upload.size, SNIFF_SIZE):
+            f.seek(0)
+            upload.content_type = sniff_content_type(f.read(SNIFF_SIZE), upload.extension) or ''
+            update_fields.append('content_type')
+        upload.save(update_fields=update_fields)
+    return written
+
+
+def discard_upload(upload):
+    """Delete an upload session and the bytes received for it"""
+    default_storage.delete(upload.file_name)
+    upload.delete()
+
+
+def expire_stale_uploads(now=None):
+    """
+    Discard unfinished uploads untouched for CV_UPLOAD_EXPIRY_HOURS, and
+    forget finished ones (their file now belongs to the CV)
+
+    Returns:
+        int: Unfinished uploads discarded
+    """
+    cutoff = (now or timezone.now()) - timedelta(hours=settings.CV_UPLOAD_EXPIRY_HOURS)
+    stale = CVUpload.objects.filter(updated_at__lt=cutoff)
+    expired = 0
+    for upload in stale.filter(cv__isnull=True).iterator():
+        discard_upload(upload)
+        expired += 1
+    stale.filter(cv__isnull=False).delete()
+    return expired
@@ -1,9 +1,23 @@
 from django.urls import path
-from .views import JobCreateView, JobUpdateView, JobListView, RecommendedJobListView
+from .views import (
+    JobCreateView, JobBulkCreateView, JobActivityView, JobStatsView, JobUpdateView, JobListView, JobSearchView, JobDetailView, RecommendedJobListView, MatchVerificationView, CVUploadView,
+    CVUploadSessionListView, CVUploadSessionView, CVListView, CVDetailView,
+)
 
 urlpatterns = [
     path('create/', JobCreateView.as_view(), name='job-create'),
+    path('bulk/', JobBulkCreateView.as_view(), name='job-bulk-create'),
     path('<int:pk>/update/', JobUpdateView.as_view(), name='job-update'),
+    path('<int:pk>/stats/', JobStatsView.as_view(), name='job-stats'),
     path('', JobListView.as_view(), name='job-list'),
+    path('search/', JobSearchView.as_view(), name='job-search'),
+    path('activity/', JobActivityView.as_view(), name='job-activity'),
     path('recommended/', RecommendedJobListView.as_view(), name='recommended-jobs'),
+    path('matches/<str:tx_digest>/verify/', MatchVerificationView.as_view(), name='match-verify'),
+    path('cv/', CVListView.as_view(), name='cv-list'),
+    path('cv/<int:pk>/', CVDetailView.as_view(), name='cv-detail'),
+    path('cv/upload/', CVUploadView.as_view(), name='cv-upload'),
+    path('cv/uploads/', CVUploadSessionListView.as_view(), name='cv-upload-session-list'),
+    path('cv/uploads/<uuid:pk>/', CVUploadSessionView.as_view(), name='cv-upload-session'),
+    path('<slug:slug>/', JobDetailView.as_view(), name='job-detail'),
 ]
@@ -1,33 +1,243 @@
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.views import View
+from kombu.exceptions import OperationalError as KombuOperationalError
+from redis.exceptions import RedisError
 from rest_framework import generics, permissions
+from rest_framework.views import APIView
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.status import HTTP_201_CREATED, HTTP_200_OK, HTTP_500_INTERNAL_SERVER_ERROR
-from .models import Job
-from .serializers import JobSerializer, JobRecommendationSerializer
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.status import (
+    HTTP_201_CREATED, HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT, HTTP_207_MULTI_STATUS, HTTP_400_BAD_REQUEST,
+    HTTP_403_FORBIDDEN, HTTP_409_CONFLICT,
+    HTTP_411_LENGTH_REQUIRED, HTTP_413_REQUEST_ENTITY_TOO_LARGE, HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    HTTP_429_TOO_MANY_REQUESTS, HTTP_500_INTERNAL_SERVER_ERROR, HTTP_503_SERVICE_UNAVAILABLE,
+)
+from .models import Job, CV, CVUpload, CVEducation, CVWorkExperience, JobRecommendation, Skill
+from .serializers import (
+    JobSerializer, JobListSerializer, JobSearchParamsSerializer, RecommendedJobSerializer, CVUploadSerializer,
+    CVUploadSessionSerializer, CVSerializer, CVContactInfoSerializer, CVEducationSerializer,
+    CVWorkExperienceSerializer, JobRecommendationSerializer, SkillSerializer, JobActivityEventSerializer,
+)
+from .pagination import StandardResultsPagination, JobCursorPagination, CVPagination
+from .feed import RecommendationFeed, recommendations_from_database
+from .list_cache import CachedListMixin
+from .popularity import aattach_popularity, attach_popularity, live_stats, popularity, record_activity
+from .search import search_jobs
+from .services.admission import cv_admission
+from .services.activity_buffer import activity_buffer
+from .tasks import index_new_jobs, process_single_cv
+from .bulk import create_jobs
+from .uploads import SNIFF_SIZE, UploadConflict, content_hash, discard_upload, start_upload, write_chunk
+from skillsverse_backend.async_api import aauthenticate, error_response, json_response, unauthorized
+from skillsverse_backend.renderers import ORJSONRenderer
+from skillsverse_backend.sui import SuiNetworkClient
+from skillsverse_backend.throttling import UploadChunkThrottle, UploadThrottle
 #from .walrus_client import walrus_client
 
-class StandardResultsPagination(PageNumberPagination):
-    page_size = 12
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+logger = logging.getLogger(__name__)
 
-class JobListView(generics.ListAPIView):
-    serializer_class = JobSerializer
+def narrow_to_fields(queryset, request):
+    """
+    Load only the columns JobListSerializer will output for this request
+
+    Honours ``?fields=``; id and created_at are always loaded because
+    pagination cursors are built from them.
+    """
+    fields = JobListSerializer.requested_fields(request)
+    columns = {'id', 'created_at', *(name for name in fields if name not in JobListSerializer.COMPUTED_FIELDS)}
+    queryset = queryset.only(*columns)
+    if 'skills' in fields:
+        queryset = queryset.prefetch_related('skills')
+    return queryset
+
+def serializer_columns(serializer_class, *keys):
+    """
+    Columns ``serializer_class`` reads from its model, for only()
+
+    ``keys`` are added for the joins the serializer does not output, such
+    as the foreign key a prefetch is matched on.
+    """
+    model = serializer_class.Meta.model
+    concrete = {field.name for field in model._meta.concrete_fields}
+    sources = {field.source for field in serializer_class().fields.values()}
+    return sorted((sources & concrete) | {model._meta.pk.name, *keys})
+
+def cv_queryset(user):
+    """
+    The user's CVs with everything CVSerializer nests, in a fixed number of queries
+
+    One query for the CVs and their contact info, plus one per prefetch:
+    skills, education, work experience, recommendations with their jobs, and
+    those jobs' skills. Each loads only the columns its serializer outputs.
+    """
+    skills = Skill.objects.only(*serializer_columns(SkillSerializer))
+    job_columns = serializer_columns(JobListSerializer)
+    recommendations = JobRecommendation.objects.select_related('job').only(
+        *serializer_columns(JobRecommendationSerializer, 'cv'),
+        *(f'job__{column}' for column in job_columns),
+    )
+    contact_columns = serializer_columns(CVContactInfoSerializer, 'cv')
+    return (
+        CV.objects.filter(created_by=user)
+        .select_related('contact_info')
+        .only(
+            *serializer_columns(CVSerializer),
+            *(f'contact_info__{column}' for column in contact_columns),
+        )
+        .prefetch_related(
+            Prefetch('extracted_skills', queryset=skills),
+            Prefetch('education', queryset=CVEducation.objects.only(*serializer_columns(CVEducationSerializer, 'cv'))),
+            Prefetch(
+                'work_experience',
+                queryset=CVWorkExperience.objects.only(*serializer_columns(CVWorkExperienceSerializer, 'cv')),
+            ),
+            Prefetch('recommendations', queryset=recommendations),
+            Prefetch('recommendations__job__skills', queryset=skills),
+        )
+    )
+
+class PopularityMixin:
+    """Adds each listed job's popularity score, with one Redis call per page"""
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and 'popularity' in JobListSerializer.requested_fields(self.request):
+            attach_popularity(page)
+        return page
+
+class JobListView(PopularityMixin, CachedListMixin, generics.ListAPIView):
+    serializer_class = JobListSerializer
     pagination_class = StandardResultsPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     queryset = Job.objects.all().order_by('-created_at')
     
+    @property
+    def paginator(self):
+        """Page numbers by default; keyset pagination for ?pagination=cursor or a ?cursor= link"""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if 'cursor' in params or params.get('pagination') == 'cursor':
+                self._paginator = JobCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+    
     def get_queryset(self):
-        return self.queryset.select_related('created_by')
+        # Cross-listed copies of a posting are only shown once
+        return narrow_to_fields(self.queryset.filter(canonical__isnull=True), self.request)
 
-class RecommendedJobListView(generics.ListAPIView):
-    serializer_class = JobRecommendationSerializer
+class JobSearchView(PopularityMixin, CachedListMixin, generics.ListAPIView):
+    """
+    Full-text job search with structured filters, best matches first.
+    
+    ?q=python django&location=remote&employment_type=Full-time
+    &salary_min=50000&salary_max=120000&source=RemoteOK&tags=python,aws
+    """
+    serializer_class = JobListSerializer
     pagination_class = StandardResultsPagination
-    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     
     def get_queryset(self):
-        return JobRecommendation.objects.filter(
-            cv__created_by=self.request.user
-        ).select_related('job', 'job__created_by').prefetch_related('job__skills').order_by('-created_at')
+        params = JobSearchParamsSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = dict(params.validated_data)
+        query = filters.pop('q', '')
+        return search_jobs(query, queryset=narrow_to_fields(Job.objects.all(), self.request), **filters)
+
+class JobDetailView(generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    queryset = Job.objects.select_related('created_by').prefetch_related('skills')
+    lookup_field = 'slug'
+
+class JobStatsView(APIView):
+    """A job's activity so far today, counted live in Redis, and its popularity score"""
+    
+    def get(self, request, pk):
+        job = get_object_or_404(Job.objects.only('id'), pk=pk)
+        try:
+            today = live_stats(job.id)
+            score = popularity([job.id])[job.id]
+        except RedisError as e:
+            logger.warning(f"Job stats unavailable: {e}")
+            return Response({"error": "Job stats are temporarily unavailable."}, status=HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"id": job.id, "today": today, "popularity": score})
+
+class RecommendedJobListView(View):
+    """
+    Jobs recommended for any of the user's CVs, best match first.
+    
+    A native async view over the Redis feed (see jobs.feed), paginated like
+    StandardResultsPagination: ?page=2&page_size=24.
+    """
+    async def get(self, request):
+        user = await aauthenticate(request)
+        if user is None:
+            return unauthorized()
+        
+        pagination = StandardResultsPagination
+        try:
+            page_number = int(request.GET.get('page', 1))
+            page_size = int(request.GET.get(pagination.page_size_query_param, pagination.page_size))
+        except ValueError:
+            return error_response("Invalid page.", 404)
+        if page_number < 1:
+            return error_response("Invalid page.", 404)
+        if page_size <= 0:
+            page_size = pagination.page_size
+        page_size = min(page_size, pagination.max_page_size)
+        
+        jobs = Job.objects.only(
+            *(name for name in JobListSerializer.Meta.fields if name not in JobListSerializer.COMPUTED_FIELDS)
+        ).prefetch_related('skills')
+        start = (page_number - 1) * page_size
+        try:
+            feed = await RecommendationFeed.afor_user(user.id, jobs)
+            count = await feed.acount()
+            page = await feed.apage(start, start + page_size)
+        except RedisError as e:
+            logger.warning(f"Recommendation feed unavailable: {e}")
+            matches = recommendations_from_database(user.id, jobs)
+            count = await matches.acount()
+            page = [job async for job in matches[start:start + page_size]]
+        if page_number > 1 and start >= count:
+            return error_response("Invalid page.", 404)
+        await aattach_popularity(page)
+        
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, 'page', page_number + 1) if start + page_size < count else None
+        if page_number == 1:
+            previous_url = None
+        elif page_number == 2:
+            previous_url = remove_query_param(url, 'page')
+        else:
+            previous_url = replace_query_param(url, 'page', page_number - 1)
+        return json_response({
+            'count': count,
+            'next': next_url,
+            'previous': previous_url,
+            'results': RecommendedJobSerializer(page, many=True).data,
+        })
+
+class MatchVerificationView(View):
+    """
+    Checks a job match recorded on the Sui chain by its transaction digest.
+    
+    A native async view: the RPC round trip to the Sui node does not hold a
+    worker thread, so one process can wait on many of them at once.
+    """
+    async def get(self, request, tx_digest):
+        if await aauthenticate(request) is None:
+            return unauthorized()
+        result = await SuiNetworkClient().averify_match(tx_digest)
+        return json_response(result, status=HTTP_200_OK if result['verified'] else 502)
 
 class JobCreateView(generics.CreateAPIView):
     queryset = Job.objects.all()
@@ -43,6 +253,94 @@ class JobCreateView(generics.CreateAPIView):
         serializer.save(created_by=user)
         return Response(serializer.data, status=HTTP_201_CREATED)
 
+class JobActivityView(APIView):
+    """
+    Record that the user viewed, saved or applied to jobs
+    
+    Takes one event or a list of up to ACTIVITY_MAX_EVENTS_PER_REQUEST. They
+    are buffered in Redis and reach JobActivity at the next flush, so the
+    request writes nothing to the database; repeats are dropped then. They
+    count towards the jobs' popularity straight away.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        many = isinstance(request.data, list)
+        if many and len(request.data) > settings.ACTIVITY_MAX_EVENTS_PER_REQUEST:
+            return Response(
+                {"error": f"At most {settings.ACTIVITY_MAX_EVENTS_PER_REQUEST} events can be sent per request."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        serializer = JobActivityEventSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data if many else [serializer.validated_data]
+        events = [(event['job'], event['activity_type']) for event in events]
+        activity_buffer.push(request.user.id, events)
+        record_activity(request.user.id, events)
+        return Response({"accepted": len(events)}, status=HTTP_202_ACCEPTED)
+
+def queue_job_indexing(job_ids):
+    try:
+        index_new_jobs.delay(job_ids)
+    except KombuOperationalError as e:
+        # The jobs are saved; workers index them at their next full rebuild
+        logger.warning(f"Could not queue indexing of {len(job_ids)} new jobs: {e}")
+
+class JobBulkCreateView(APIView):
+    """
+    Create up to JOB_BULK_CREATE_MAX_ITEMS jobs from a JSON list in one request
+    
+    Each item is validated like a JobCreateView body. The valid ones are
+    inserted together and the response lists every item's outcome in
+    request order: 201 when all were created, 207 when only some were, 400
+    when none were.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        user = request.user
+        if not user.is_organization:
+            return Response({"error": "Only organizations can create jobs."}, status=HTTP_403_FORBIDDEN)
+        
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({"error": "Expected a non-empty list of jobs."}, status=HTTP_400_BAD_REQUEST)
+        if len(items) > settings.JOB_BULK_CREATE_MAX_ITEMS:
+            return Response(
+                {"error": f"At most {settings.JOB_BULK_CREATE_MAX_ITEMS} jobs can be created per request."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        
+        results = []
+        jobs = []
+        for index, item in enumerate(items):
+            serializer = JobSerializer(data=item)
+            if serializer.is_valid():
+                job = Job(**serializer.validated_data, created_by=user)
+                jobs.append(job)
+                results.append({"index": index, "status": HTTP_201_CREATED, "job": job})
+            else:
+                results.append({"index": index, "status": HTTP_400_BAD_REQUEST, "errors": serializer.errors})
+        
+        create_jobs(jobs)
+        if jobs:
+            job_ids = [job.id for job in jobs]
+            transaction.on_commit(lambda: queue_job_indexing(job_ids))
+        for result in results:
+            if "job" in result:
+                job = result.pop("job")
+                result.update(id=job.id, slug=job.slug)
+        
+        if len(jobs) == len(items):
+            status = HTTP_201_CREATED
+        elif jobs:
+            status = HTTP_207_MULTI_STATUS
+        else:
+            status = HTTP_400_BAD_REQUEST
+        return Response(
+            {"created": len(jobs), "failed": len(items) - len(jobs), "results": results}, status=status
+        )
+
 class JobUpdateView(generics.UpdateAPIView):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
@@ -65,3 +363,233 @@ class JobUpdateView(generics.UpdateAPIView):
 
         serializer.save()
         return Response(serializer.data, status=HTTP_200_OK)
+
+
+def submit_cv(user, file_hash, create_cv):
+    """
+    Queue a newly uploaded CV for parsing
+    
+    A file the user has already uploaded returns their existing CV (200).
+    Otherwise a processing slot is reserved before the CV is created with
+    ``create_cv()``, so shed uploads cost nothing (429 with a retry hint),
+    and the admitted CV is queued (202 with its queue position).
+    
+    Returns:
+        tuple: (CV or None, whether it was created, Response)
+    """
+    existing = CV.objects.filter(created_by=user, content_hash=file_hash).exclude(content_hash='').first()
+    if existing is not None:
+        data = dict(CVUploadSerializer(existing).data)
+        data["duplicate"] = True
+        return existing, False, Response(data, status=HTTP_200_OK)
+    
+    is_first_cv = not CV.objects.filter(created_by=user).exists()
+    admission = cv_admission.admit(user.id, is_first_cv)
+    if not admission.admitted:
+        return None, False, Response(
+            {
+                "error": "CV processing is at capacity. Please retry later.",
+                "retry_after": admission.retry_after,
+            },
+            status=HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(admission.retry_after)},
+        )
+    
+    try:
+        cv = create_cv()
+    except Exception:
+        cv_admission.release(admission.ticket, user.id)
+        raise
+    
+    position = cv_admission.bind(admission.ticket, cv.id)
+    process_single_cv.apply_async(
+        (cv.id,), priority=cv_admission.celery_priority(admission.priority)
+    )
+    
+    data = dict(CVUploadSerializer(cv).data)
+    data["queue_position"] = position
+    return cv, True, Response(data, status=HTTP_202_ACCEPTED)
+
+class CVListView(generics.ListAPIView):
+    """The user's CVs, newest first, with their parsed details and recommendations"""
+    serializer_class = CVSerializer
+    pagination_class = CVPagination
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return cv_queryset(self.request.user)
+
+class CVDetailView(generics.RetrieveAPIView):
+    serializer_class = CVSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return cv_queryset(self.request.user)
+
+class CVUploadView(generics.CreateAPIView):
+    serializer_class = CVUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UploadThrottle]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['file']
+        file_hash = content_hash(upload)
+        upload.seek(0)
+        
+        _, _, response = submit_cv(
+            request.user, file_hash,
+            lambda: serializer.save(created_by=request.user, content_hash=file_hash),
+        )
+        return response
+
+class CVUploadSessionListView(generics.CreateAPIView):
+    """
+    Start a resumable CV upload: POST {"original_filename": "cv.pdf", "size": 123456}.
+    
+    Then PATCH the bytes to the returned upload's URL in as many chunks as
+    needed (see CVUploadSessionView). Nothing is queued until the last
+    byte arrives.
+    """
+    serializer_class = CVUploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UploadThrottle]
+    
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        serializer.instance = start_upload(self.request.user, data['original_filename'], data['size'])
+    
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        upload_url = request.build_absolute_uri(f"{request.path}{response.data['id']}/")
+        response['Location'] = upload_url
+        response['Upload-Offset'] = '0'
+        response['Upload-Max-Chunk-Size'] = str(settings.CV_UPLOAD_MAX_CHUNK_SIZE)
+        return response
+
+class CVUploadSessionView(APIView):
+    """
+    One resumable CV upload, tus-style.
+    
+    GET/HEAD report how many bytes have arrived (``Upload-Offset``).
+    PATCH appends the request body, sent as application/offset+octet-stream
+    with ``Upload-Offset`` set to the current offset, in chunks of at most
+    ``Upload-Max-Chunk-Size`` bytes. A chunk is stored whole or not at all,
+    so after an interrupted one, HEAD and resend from the offset it
+    returns. The PATCH carrying
+    the last byte creates the CV and queues it, answering like the
+    multipart upload endpoint (202, 200 for a duplicate, 429 when shed;
+    after a 429, PATCH an empty body to retry). DELETE abandons the upload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UploadChunkThrottle]
+    CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'
+    
+    def get_upload(self, pk):
+        return get_object_or_404(CVUpload, pk=pk, created_by=self.request.user)
+    
+    @staticmethod
+    def offset_headers(upload):
+        return {
+            'Upload-Offset': str(upload.offset),
+            'Upload-Length': str(upload.size),
+            'Upload-Max-Chunk-Size': str(settings.CV_UPLOAD_MAX_CHUNK_SIZE),
+            'Cache-Control': 'no-store',
+        }
+    
+    def get(self, request, pk):
+        upload = self.get_upload(pk)
+        return Response(CVUploadSessionSerializer(upload).data, headers=self.offset_headers(upload))
+    
+    def delete(self, request, pk):
+        upload = self.get_upload(pk)
+        if upload.cv_id is None:
+            discard_upload(upload)
+        return Response(status=HTTP_204_NO_CONTENT)
+    
+    def patch(self, request, pk):
+        upload = self.get_upload(pk)
+        if upload.cv_id is not None:
+            # Already finished, e.g. a retried last chunk whose response was lost
+            return Response(CVUploadSerializer(upload.cv).data, status=HTTP_200_OK)
+        if request.content_type.split(';')[0].strip() != self.CHUNK_CONTENT_TYPE:
+            return Response(
+                {"error": f"Send chunks as {self.CHUNK_CONTENT_TYPE}."}, status=HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header is required."}, status=HTTP_400_BAD_REQUEST)
+        if request.META.get('CONTENT_LENGTH') in (None, ''):
+            return Response({"error": "Content-Length header is required."}, status=HTTP_411_LENGTH_REQUIRED)
+        try:
+            length = int(request.META['CONTENT_LENGTH'])
+        except ValueError:
+            length = -1
+        if length < 0:
+            return Response({"error": "Content-Length must be a non-negative integer."}, status=HTTP_400_BAD_REQUEST)
+        if offset != upload.offset:
+            return Response(
+                {"error": "Upload-Offset does not match the bytes received.", "offset": upload.offset},
+                status=HTTP_409_CONFLICT, headers=self.offset_headers(upload),
+            )
+        if length > settings.CV_UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {
+                    "error": f"Chunks can be at most {settings.CV_UPLOAD_MAX_CHUNK_SIZE} bytes.",
+                    "max_chunk_size": settings.CV_UPLOAD_MAX_CHUNK_SIZE,
+                },
+                status=HTTP_413_REQUEST_ENTITY_TOO_LARGE, headers=self.offset_headers(upload),
+            )
+        if offset + length > upload.size:
+            return Response(
+                {"error": "Chunk runs past the declared file size."}, status=HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        
+        if length:
+            try:
+                write_chunk(upload, request.stream, length, offset)
+            except UploadConflict:
+                upload.refresh_from_db(fields=['offset'])
+                return Response(
+                    {"error": "Another request is writing to this upload.", "offset": upload.offset},
+                    status=HTTP_409_CONFLICT, headers=self.offset_headers(upload),
+                )
+            if not upload.content_type and upload.offset >= min(upload.size, SNIFF_SIZE):
+                # Checked on the first bytes, before the rest is sent
+                discard_upload(upload)
+                return Response(
+                    {"error": f"The file contents are not a valid {upload.extension} file."},
+                    status=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                )
+        
+        if not upload.is_complete:
+            return Response(status=HTTP_204_NO_CONTENT, headers=self.offset_headers(upload))
+        return self.finish(upload)
+    
+    def finish(self, upload):
+        user = self.request.user
+        
+        def create_cv():
+            with transaction.atomic():
+                cv = CV.objects.create(
+                    created_by=user,
+                    file=upload.file_name,
+                    original_filename=upload.original_filename,
+                    content_hash=upload.content_hash,
+                )
+                upload.cv = cv
+                upload.save(update_fields=['cv', 'updated_at'])
+            return cv
+        
+        cv, created, response = submit_cv(user, upload.content_hash, create_cv)
+        if cv is not None and not created:
+            # Same bytes as a CV the user already has
+            default_storage.delete(upload.file_name)
+            upload.cv = cv
+            upload.save(update_fields=['cv', 'updated_at'])
+        for header, value in self.offset_headers(upload).items():
+            response[header] = value
+        return response
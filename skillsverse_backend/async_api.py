@@ -0,0 +1,58 @@
+"""
+Helpers for native async Django views.
+
+DRF views are synchronous: under an ASGI server each one occupies a worker
+thread for as long as it waits on the database, Redis or an upstream API.
+I/O-bound endpoints are written as plain ``async def`` Django views instead
+and use these helpers for what DRF would otherwise provide.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .renderers import ORJSONRenderer
+
+_jwt_authentication = JWTAuthentication()
+_renderer = ORJSONRenderer()
+
+
+async def aauthenticate(request):
+    """
+    The user named by the request's JWT bearer token, or None
+
+    Runs the same checks as the DRF views' JWTAuthentication, including its
+    ``get_user`` (active user, revoked tokens); only the user lookup leaves
+    the event loop, in a worker thread.
+    """
+    header = _jwt_authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = _jwt_authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = _jwt_authentication.get_validated_token(raw_token)
+        return await sync_to_async(_jwt_authentication.get_user)(token)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+
+
+def json_response(data, status=200, headers=None):
+    """JSON response rendered the same way as the DRF views"""
+    return HttpResponse(
+        _renderer.render(data), status=status, headers=headers, content_type='application/json'
+    )
+
+
+def error_response(detail, status, headers=None):
+    """DRF-shaped error body, e.g. {"detail": "Invalid page."}"""
+    return json_response({'detail': detail}, status=status, headers=headers)
+
+
+def unauthorized():
+    return error_response(
+        "Authentication credentials were not provided or are invalid.", 401,
+        headers={'WWW-Authenticate': _jwt_authentication.authenticate_header(None)},
+    )
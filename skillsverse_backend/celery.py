@@ -7,6 +7,9 @@ app = Celery("skillsverse_backend")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
+# Registers the queue-wait/runtime profiling signal handlers
+from . import task_metrics  # noqa: E402,F401
+
 app.conf.beat_schedule = {
     'fetch-jobs-every-hour': {
         'task': 'jobs.tasks.fetch_jobs_task',
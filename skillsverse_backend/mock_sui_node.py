@@ -0,0 +1,92 @@
+"""
+Local stand-in for a Sui full node's JSON-RPC endpoint.
+
+Answers every call after a configurable delay, so chain-bound endpoints can
+be load-tested offline against a node that is as slow as a real one.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockSuiNode:
+    """
+    In-process JSON-RPC server; point ``SUI_RPC_URL`` at ``url``.
+
+    ``sui_getTransaction`` returns a minimal transaction for any digest and
+    every other method returns an empty result.
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        """
+        Args:
+            latency (float): Seconds to wait before answering each call
+            host (str): Interface to listen on
+            port (int): Port to listen on; 0 picks a free one
+        """
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.node = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def answer(self, call):
+        with self._lock:
+            self.calls += 1
+        if call.get("method") == "sui_getTransaction":
+            result = {"digest": (call.get("params") or [""])[0], "effects": {"status": {"status": "success"}}}
+        else:
+            result = {}
+        return {"jsonrpc": "2.0", "id": call.get("id", 1), "result": result}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        node = self.server.node
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            call = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            call = {}
+        if node.latency:
+            time.sleep(node.latency)
+        body = json.dumps(node.answer(call)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
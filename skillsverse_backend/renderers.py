@@ -0,0 +1,25 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, for the views whose payloads it was measured on.
+
+    orjson encodes several times faster than the stdlib ``json`` module DRF
+    uses. Output matches JSONRenderer's: dates and times, and types orjson
+    does not know (lazy translation strings, Decimals that a serializer did
+    not coerce, ...), go through DRF's encoder, non-str dict keys are
+    converted, and indented output for the browsable API is still produced
+    by DRF.
+    """
+    _fallback_encoder = JSONEncoder()
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._fallback_encoder.default, option=self.options)
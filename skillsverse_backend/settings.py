@@ -84,6 +84,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'skillsverse_backend.wsgi.application'
+ASGI_APPLICATION = 'skillsverse_backend.asgi.application'
 
 
 # Database
@@ -93,6 +94,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a write waits for the database lock; the activity flusher
+        # writes while requests do
+        'OPTIONS': {'timeout': 20},
     }
 }
 
@@ -122,6 +126,21 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Reverse proxies in front of the app; client IPs for throttling are
+    # taken from X-Forwarded-For only that many hops deep, so clients
+    # cannot pick their own. The Procfile deployment sits behind one router
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '1')),
+    # Token buckets per IP, and per wallet for ``<scope>_wallet`` rates
+    # (see skillsverse_backend.throttling). IP rates leave room for users
+    # sharing an address
+    'DEFAULT_THROTTLE_RATES': {
+        'nonce': '10/min',
+        'login': '10/min',
+        'upload': '60/hour',
+        'upload_wallet': '20/hour',
+        'upload_chunk': '600/min',
+        'upload_chunk_wallet': '120/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -162,6 +181,12 @@ CELERY_RESULT_BACKEND = os.getenv(
 )  # Store results in Redis
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
+# Lets the Redis broker honour task priorities (0 is served first)
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
 
 
 CELERY_BEAT_SCHEDULE = {
@@ -169,10 +194,84 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'jobs.tasks.scheduled_cv_processing',
         'schedule': 3600,
     },
+    'archive-expired-jobs-daily': {
+        'task': 'jobs.tasks.archive_expired_jobs',
+        'schedule': 86400,
+    },
+    'expire-stale-cv-uploads-hourly': {
+        'task': 'jobs.tasks.expire_stale_cv_uploads',
+        'schedule': 3600,
+    },
+    'flush-job-activity': {
+        'task': 'jobs.tasks.flush_job_activity',
+        'schedule': 10,
+    },
+    'roll-up-job-stats': {
+        'task': 'jobs.tasks.roll_up_job_stats',
+        'schedule': 900,
+    },
 }
 
+# Seconds a paginated list's total count is reused before it is recounted
+PAGINATION_COUNT_TTL = 60
+
+# Seconds a rendered job list page is served from Redis (pages are also
+# invalidated as soon as any job changes, see jobs.list_cache)
+JOB_LIST_CACHE_TTL = 300
+
+# Seconds an idle user's recommendation feed stays in Redis; it is rebuilt
+# from JobRecommendation on the next read (see jobs.feed)
+RECOMMENDATION_FEED_TTL = 7 * 24 * 3600
+
 # Job Expiry Setting
 JOB_EXPIRY_DAYS = 30
+JOB_ARCHIVE_BATCH_SIZE = 1000  # Expired jobs moved to the archive per transaction
+
+# Number of feed records mapped, deduplicated and committed together during ingest
+JOB_INGEST_BATCH_SIZE = 500
+
+# Most jobs an organization can post in one bulk request (see jobs.bulk)
+JOB_BULK_CREATE_MAX_ITEMS = 500
+
+# Buffered job activity (see jobs.services.activity_buffer)
+ACTIVITY_MAX_EVENTS_PER_REQUEST = 100
+ACTIVITY_FLUSH_BATCH_SIZE = 2000  # Events per database write; Redis caps a Lua unpack() near 8000
+ACTIVITY_FLUSH_MAX_BATCHES = 50  # Per flush run, so one run does not hold the flush lock for long
+ACTIVITY_FLUSH_LOCK_TIMEOUT = 300  # Seconds before a crashed flush's lock is released
+
+# Job popularity (see jobs.popularity): unique viewers over the last
+# JOB_POPULARITY_DAYS plus weighted saves
+JOB_POPULARITY_DAYS = 7
+JOB_POPULARITY_SAVE_WEIGHT = 3
+JOB_POPULARITY_RECOMMENDATION_WEIGHT = 0.1  # The most popular job's recommendation score is raised by this fraction
+
+# Feed URL per job source (see jobs.job_sources); point these at a local
+# mock board (python manage.py mock_job_board) to run ingest offline
+JOB_SOURCE_URLS = {
+    "remoteok": os.getenv("REMOTEOK_API_URL", "https://remoteok.io/api"),
+    "arbeitnow": os.getenv("ARBEITNOW_API_URL", "https://www.arbeitnow.com/api/job-board-api"),
+}
+
+# CV upload admission control
+CV_QUEUE_MAX_DEPTH = int(os.getenv("CV_QUEUE_MAX_DEPTH", 2000))  # Budget for first-time CVs
+CV_QUEUE_REUPLOAD_MAX_DEPTH = int(os.getenv("CV_QUEUE_REUPLOAD_MAX_DEPTH", 1000))  # Re-uploads are shed earlier
+CV_MAX_INFLIGHT_PER_USER = 3
+CV_ADMISSION_SECONDS_PER_CV = 2  # Rough worker throughput, used for Retry-After hints
+CV_ADMISSION_TTL = 3600  # Queue entries older than this are treated as abandoned
+
+# Resumable CV uploads (see jobs.uploads)
+CV_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # Bytes
+# Per resumable-upload PATCH. Django reads each request body whole before the
+# view runs; below FILE_UPLOAD_MAX_MEMORY_SIZE it stays in memory
+CV_UPLOAD_MAX_CHUNK_SIZE = 2 * 1024 * 1024
+CV_UPLOAD_EXPIRY_HOURS = 24  # Unfinished uploads idle this long are discarded
+
+# Sui JSON-RPC node used to record and verify job matches (see skillsverse_backend.sui)
+SUI_RPC_URL = os.getenv("SUI_RPC_URL", "https://fullnode.testnet.sui.io:443")
+SUI_PACKAGE_ID = os.getenv("SUI_PACKAGE_ID", "")
+SUI_ADMIN_ADDRESS = os.getenv("SUI_ADMIN_ADDRESS", "")
+SUI_RPC_TIMEOUT = float(os.getenv("SUI_RPC_TIMEOUT", 10))  # Seconds
+SUI_RPC_MAX_CONNECTIONS = int(os.getenv("SUI_RPC_MAX_CONNECTIONS", 200))  # Per async worker process
 
 # settings.py
 REDIS_HOST = "localhost"
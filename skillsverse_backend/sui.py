@@ -1,6 +1,9 @@
 # core/blockchain/sui.py
 
+import asyncio
 import json
+import weakref
+import httpx
 import requests
 import base64
 import logging
@@ -10,6 +13,21 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# One pooled async HTTP client per event loop; building a client (its TLS
+# context in particular) costs far more CPU than the request itself
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            timeout=settings.SUI_RPC_TIMEOUT,
+            limits=httpx.Limits(max_connections=settings.SUI_RPC_MAX_CONNECTIONS),
+        )
+    return client
+
 class SuiNetworkClient:
     """Client for interacting with the Sui blockchain network"""
     
@@ -20,24 +38,38 @@ class SuiNetworkClient:
         }
         self.package_id = settings.SUI_PACKAGE_ID
         self.admin_address = settings.SUI_ADMIN_ADDRESS
-        
-    def _make_rpc_call(self, method: str, params: List[Any]) -> Dict[str, Any]:
-        """Make a JSON-RPC call to the Sui network"""
-        payload = {
+        self.timeout = settings.SUI_RPC_TIMEOUT
+    
+    @staticmethod
+    def _payload(method: str, params: List[Any]) -> Dict[str, Any]:
+        return {
             "jsonrpc": "2.0",
             "id": 1,
             "method": method,
             "params": params
         }
-        
-        response = requests.post(self.rpc_url, json=payload, headers=self.headers)
-        response.raise_for_status()
-        
-        result = response.json()
+    
+    @staticmethod
+    def _result(result: Dict[str, Any]) -> Any:
         if "error" in result:
             raise Exception(f"RPC Error: {result['error']['message']}")
-            
         return result["result"]
+        
+    def _make_rpc_call(self, method: str, params: List[Any]) -> Dict[str, Any]:
+        """Make a JSON-RPC call to the Sui network"""
+        response = requests.post(
+            self.rpc_url, json=self._payload(method, params), headers=self.headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return self._result(response.json())
+    
+    async def _amake_rpc_call(self, method: str, params: List[Any]) -> Dict[str, Any]:
+        """Async variant of _make_rpc_call; the event loop serves other requests while the node answers"""
+        response = await _get_async_client().post(
+            self.rpc_url, json=self._payload(method, params), headers=self.headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return self._result(response.json())
     
     def get_objects_owned_by_address(self, address: str) -> List[Dict[str, Any]]:
         """Get objects owned by a specific address"""
@@ -47,6 +79,10 @@ class SuiNetworkClient:
         """Get transaction details by digest"""
         return self._make_rpc_call("sui_getTransaction", [digest])
     
+    async def aget_transaction(self, digest: str) -> Dict[str, Any]:
+        """Async variant of get_transaction"""
+        return await self._amake_rpc_call("sui_getTransaction", [digest])
+    
     def execute_move_call(self, 
                          signer: str,
                          package_object_id: str, 
@@ -124,18 +160,31 @@ class SuiNetworkClient:
         """
         try:
             tx_details = self.get_transaction(tx_digest)
-            # In a real implementation, we would parse the events from the transaction
-            # to extract the match details
-            
-            # Placeholder for demonstration
-            return {
-                "verified": True,
-                "transaction": tx_digest,
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._verification(tx_digest, tx_details)
+        except Exception as e:
+            logger.error(f"Error verifying match: {str(e)}")
+            return {"verified": False, "error": str(e)}
+    
+    async def averify_match(self, tx_digest: str) -> Dict[str, Any]:
+        """Async variant of verify_match"""
+        try:
+            tx_details = await self.aget_transaction(tx_digest)
+            return self._verification(tx_digest, tx_details)
         except Exception as e:
             logger.error(f"Error verifying match: {str(e)}")
             return {"verified": False, "error": str(e)}
+    
+    @staticmethod
+    def _verification(tx_digest: str, tx_details: Dict[str, Any]) -> Dict[str, Any]:
+        # In a real implementation, we would parse the events from the transaction
+        # to extract the match details
+        
+        # Placeholder for demonstration
+        return {
+            "verified": True,
+            "transaction": tx_digest,
+            "timestamp": datetime.now().isoformat()
+        }
 
 # Example Move contract for job matching on Sui
 """
@@ -170,4 +219,11 @@ module job_matching::matching {
             user_address,
             job_id: string::utf8(job_id),
             match_score,
-            profile_id: string::utf8(profile_id),
\ No newline at end of file
+            profile_id: string::utf8(profile_id),
+            timestamp: string::utf8(timestamp),
+            verified: true
+        };
+        transfer::share_object(job_match);
+    }
+}
+"""
@@ -0,0 +1,207 @@
+"""
+Celery task profiling.
+
+Records, per task name, how long messages wait in the queue before a worker
+picks them up, how long they run, how much the worker's RSS grows while they
+run, and how often they are retried. Samples go into log-bucketed histograms
+in Redis, one set per time window, so percentiles can be read back over a
+rolling period (see ``python manage.py task_stats``).
+"""
+import logging
+import math
+import os
+import resource
+import time
+from datetime import datetime
+
+from celery.signals import before_task_publish, task_prerun, task_postrun, task_retry
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+ENQUEUED_AT_HEADER = 'enqueued_at'
+
+WINDOW_SECONDS = 300  # One histogram per task and metric every 5 minutes
+RETENTION_WINDOWS = 12  # Keep an hour of windows
+
+# Histogram buckets grow geometrically from the smallest value worth
+# distinguishing, which keeps percentiles within ~10% at any scale
+BUCKET_GROWTH = 1.2
+METRICS = {
+    'queue_wait': 0.001,  # seconds
+    'runtime': 0.001,  # seconds
+    'rss_delta': 1024,  # bytes
+}
+
+TASKS_KEY = 'taskstats:tasks'
+HISTOGRAM_KEY = 'taskstats:{window}:{task}:{metric}'
+COUNTERS_KEY = 'taskstats:{window}:{task}:counters'
+
+# task_id -> (perf counter at start, RSS at start)
+_running = {}
+
+
+def _redis():
+    from skillsverse_backend.walrus_db import db
+    return db
+
+
+def _current_window():
+    return int(time.time()) // WINDOW_SECONDS
+
+
+def _rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Peak RSS is the best portable fallback (kilobytes on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def bucket_for(value, minimum):
+    if value <= minimum:
+        return 0
+    return math.ceil(math.log(value / minimum, BUCKET_GROWTH))
+
+
+def bucket_upper_bound(bucket, minimum):
+    return minimum * BUCKET_GROWTH ** bucket
+
+
+def _record(task_name, samples, counters):
+    window = _current_window()
+    ttl = WINDOW_SECONDS * (RETENTION_WINDOWS + 1)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.sadd(TASKS_KEY, task_name)
+        for metric, value in samples.items():
+            key = HISTOGRAM_KEY.format(window=window, task=task_name, metric=metric)
+            pipe.hincrby(key, bucket_for(value, METRICS[metric]), 1)
+            pipe.expire(key, ttl)
+        key = COUNTERS_KEY.format(window=window, task=task_name)
+        for counter, amount in counters.items():
+            pipe.hincrby(key, counter, amount)
+        pipe.expire(key, ttl)
+        pipe.execute()
+    except RedisError as e:
+        # Profiling must never affect the task itself
+        logger.warning(f"Could not record metrics for {task_name}: {e}")
+
+
+def _queue_wait(request):
+    enqueued_at = getattr(request, ENQUEUED_AT_HEADER, None)
+    if enqueued_at is None:
+        enqueued_at = (getattr(request, 'headers', None) or {}).get(ENQUEUED_AT_HEADER)
+    if enqueued_at is None:
+        return None
+    # Scheduled tasks are not "waiting" before their ETA
+    eta = getattr(request, 'eta', None)
+    if eta:
+        try:
+            enqueued_at = max(float(enqueued_at), datetime.fromisoformat(eta).timestamp())
+        except (TypeError, ValueError):
+            pass
+    return max(0.0, time.time() - float(enqueued_at))
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, task=None, **kwargs):
+    _running[task_id] = (time.perf_counter(), _rss_bytes())
+    wait = _queue_wait(task.request)
+    if wait is not None:
+        _record(task.name, {'queue_wait': wait}, {})
+
+
+@task_postrun.connect
+def stop_task_timer(task_id=None, task=None, state=None, **kwargs):
+    started = _running.pop(task_id, None)
+    if started is None:
+        return
+    started_at, rss_before = started
+    counters = {'runs': 1}
+    if state == 'FAILURE':
+        counters['failures'] = 1
+    _record(
+        task.name,
+        {
+            'runtime': time.perf_counter() - started_at,
+            # Only growth is interesting; shrinking is recorded as zero
+            'rss_delta': max(0, _rss_bytes() - rss_before),
+        },
+        counters,
+    )
+
+
+@task_retry.connect
+def count_task_retry(sender=None, **kwargs):
+    _record(sender.name, {}, {'retries': 1})
+
+
+def _merge_windows(keys):
+    merged = {}
+    pipe = _redis().pipeline(transaction=False)
+    for key in keys:
+        pipe.hgetall(key)
+    for histogram in pipe.execute():
+        for field, count in histogram.items():
+            merged[int(field)] = merged.get(int(field), 0) + int(count)
+    return merged
+
+
+def _percentiles(histogram, minimum, quantiles):
+    total = sum(histogram.values())
+    if not total:
+        return {q: None for q in quantiles}
+    results = {}
+    for q in quantiles:
+        target = q * total
+        seen = 0
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen >= target:
+                results[q] = bucket_upper_bound(bucket, minimum)
+                break
+    return results
+
+
+def task_stats(windows=RETENTION_WINDOWS, quantiles=(0.5, 0.95, 0.99)):
+    """
+    Aggregate the most recent windows into percentiles per task
+
+    Args:
+        windows (int): Number of most recent windows to include
+        quantiles (tuple): Quantiles to compute, between 0 and 1
+
+    Returns:
+        dict: {task_name: {'runs': int, 'retries': int, 'failures': int,
+        <metric>: {quantile: value}}}
+    """
+    db = _redis()
+    current = _current_window()
+    recent = range(current - windows + 1, current + 1)
+    stats = {}
+    for task_name in sorted(name.decode() for name in db.smembers(TASKS_KEY)):
+        counters = {}
+        for key in (COUNTERS_KEY.format(window=w, task=task_name) for w in recent):
+            for field, value in db.hgetall(key).items():
+                counters[field.decode()] = counters.get(field.decode(), 0) + int(value)
+        entry = {
+            'runs': counters.get('runs', 0),
+            'retries': counters.get('retries', 0),
+            'failures': counters.get('failures', 0),
+        }
+        for metric, minimum in METRICS.items():
+            histogram = _merge_windows(
+                HISTOGRAM_KEY.format(window=w, task=task_name, metric=metric) for w in recent
+            )
+            entry[metric] = _percentiles(histogram, minimum, quantiles)
+        stats[task_name] = entry
+    return stats
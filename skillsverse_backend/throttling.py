@@ -0,0 +1,148 @@
+"""
+Token-bucket request throttling in Redis.
+
+Each scope has a bucket per client IP. A scope that also sets a
+``<scope>_wallet`` rate has a bucket per wallet address too, shared by all
+of that wallet's IPs; it is only used for the authenticated user's wallet,
+so nobody can empty another user's bucket to lock them out. A request
+takes one token from each of its buckets, and is turned away with a
+Retry-After hint when any is empty; buckets refill continuously at their
+rate, so a client may burst up to the full rate and then continue at the
+refill rate. The buckets are read, refilled and debited by one Lua script
+on the Redis server's clock, so the check is a single atomic round trip and
+does not depend on the web servers' clocks agreeing.
+
+Rates use DRF's notation in ``DEFAULT_THROTTLE_RATES``: "10/min" is a
+bucket of 10 tokens refilled at 10 per minute. When Redis is unavailable
+requests are let through.
+"""
+import logging
+
+from rest_framework.throttling import SimpleRateThrottle
+from redis.exceptions import RedisError
+
+from .walrus_db import db, get_async_db
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = 'throttle:{scope}:{kind}:{ident}'
+
+# KEYS: the buckets to debit; ARGV: capacity and tokens per second of each, in order
+# Returns {1, "0"} when a token was taken from every bucket, otherwise
+# {0, seconds until all of them hold one} and nothing is taken
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+if wait > 0 then
+    return {0, tostring(wait)}
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', levels[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+return {1, '0'}
+"""
+
+_token_bucket = db.register_script(TOKEN_BUCKET_SCRIPT)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Throttles a scope per client IP and, with a ``<scope>_wallet`` rate,
+    per authenticated wallet address.
+
+    Subclasses set ``scope``; its rate is parsed by SimpleRateThrottle, but
+    Django's cache is not used.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.ip_bucket = (self.num_requests, self.num_requests / self.duration)
+        self.wallet_bucket = None
+        wallet_rate = self.THROTTLE_RATES.get(f'{self.scope}_wallet')
+        if wallet_rate:
+            num_requests, duration = self.parse_rate(wallet_rate)
+            self.wallet_bucket = (num_requests, num_requests / duration)
+        self._wait = None
+
+    def get_wallet(self, request, view):
+        if request.user.is_authenticated:
+            return request.user.wallet_address
+        return None
+
+    def get_buckets(self, request, view):
+        """(key, (capacity, tokens per second)) of each bucket the request draws from"""
+        buckets = [(BUCKET_KEY.format(scope=self.scope, kind='ip', ident=self.get_ident(request)), self.ip_bucket)]
+        wallet = self.get_wallet(request, view) if self.wallet_bucket else None
+        if wallet:
+            buckets.append((BUCKET_KEY.format(scope=self.scope, kind='wallet', ident=wallet.lower()), self.wallet_bucket))
+        return buckets
+
+    def _script_args(self, request, view):
+        buckets = self.get_buckets(request, view)
+        return {
+            'keys': [key for key, _ in buckets],
+            'args': [value for _, bucket in buckets for value in bucket],
+        }
+
+    def _result(self, reply):
+        allowed, wait = reply
+        self._wait = None if allowed else float(wait)
+        return bool(allowed)
+
+    def allow_request(self, request, view):
+        try:
+            reply = _token_bucket(**self._script_args(request, view))
+        except RedisError as e:
+            logger.warning(f"Throttling unavailable, allowing request: {e}")
+            return True
+        return self._result(reply)
+
+    async def aallow_request(self, request, view):
+        """allow_request for native async views, over the async Redis client"""
+        script_args = self._script_args(request, view)
+        try:
+            reply = await get_async_db().register_script(TOKEN_BUCKET_SCRIPT)(**script_args)
+        except RedisError as e:
+            logger.warning(f"Throttling unavailable, allowing request: {e}")
+            return True
+        return self._result(reply)
+
+    def wait(self):
+        return self._wait
+
+
+class NonceThrottle(TokenBucketThrottle):
+    """Per IP only: the wallet is named by an anonymous caller, who must not drain its owner's bucket"""
+    scope = 'nonce'
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """Per IP only, like NonceThrottle"""
+    scope = 'login'
+
+
+class UploadThrottle(TokenBucketThrottle):
+    """New CV uploads, whole or resumable"""
+    scope = 'upload'
+
+
+class UploadChunkThrottle(TokenBucketThrottle):
+    """Requests against an open resumable upload, one per chunk"""
+    scope = 'upload_chunk'
@@ -1,4 +1,8 @@
 # core/walrus_db.py
+import asyncio
+import weakref
+
+import redis.asyncio
 from walrus import Database
 from django.conf import settings
 
@@ -9,3 +13,23 @@ db = Database(
     db=settings.REDIS_DB,
     password=settings.REDIS_PASSWORD,
 )
+
+
+# Async clients for async views, one per event loop: an asyncio connection
+# belongs to the loop that opened it, and outside an ASGI server (runserver,
+# tests) every async view runs on a loop of its own
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_db():
+    """asyncio Redis client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = redis.asyncio.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+        )
+    return client
@@ -9,6 +9,7 @@ from drf_spectacular.utils import extend_schema_serializer, extend_schema
 from drf_spectacular.types import OpenApiTypes
 
 from django.contrib.auth import get_user_model
+from skillsverse_backend.throttling import LoginThrottle
 
 User = get_user_model()
 
@@ -82,6 +83,7 @@ class WalletTokenObtainSerializer(TokenObtainPairSerializer):
             
 class WalletTokenObtainPairView(TokenObtainPairView):
     serializer_class = WalletTokenObtainSerializer
+    throttle_classes = [LoginThrottle]
     
     @extend_schema(
         summary="Wallet Login",
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:00
+
+import django.utils.timezone
+import users.models
+from django.db import migrations, models
+
+
+def rotate_nonces(apps, schema_editor):
+    # The old default was evaluated once per process, so existing users may share a nonce
+    User = apps.get_model('users', 'User')
+    accounts = list(User.objects.only('id'))
+    for account in accounts:
+        account.nonce = users.models.generate_nonce()
+    User.objects.bulk_update(accounts, ['nonce'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_nonce'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='last_nonce_refresh',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='nonce',
+            field=models.CharField(default=users.models.generate_nonce, max_length=100),
+        ),
+        migrations.RunPython(rotate_nonces, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,9 @@ from django.conf import settings
 from django.utils import timezone
 import secrets
 
+def generate_nonce():
+    return secrets.token_hex(16)
+
 class UserManager(BaseUserManager):
     def create_user(self, wallet_address, **extra_fields):
         if not wallet_address:
@@ -15,6 +18,14 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    async def acreate_user(self, wallet_address, **extra_fields):
+        if not wallet_address:
+            raise ValueError('The Wallet Address is required')
+        user = self.model(wallet_address=wallet_address, **extra_fields)
+        user.set_unusable_password()
+        await user.asave(using=self._db)
+        return user
+
     def create_superuser(self, wallet_address, **extra_fields):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
@@ -31,7 +42,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     behance_url = models.URLField(blank=True, null=True)
     linkedin_url = models.URLField(blank=True, null=True)
     wallet_address = models.CharField(max_length=100, unique=True)
-    nonce = models.CharField(max_length=100, default=secrets.token_hex(16))
+    nonce = models.CharField(max_length=100, default=generate_nonce)  # A fresh nonce per user
     last_nonce_refresh = models.DateTimeField(auto_now_add=True)
 
     is_active = models.BooleanField(default=True)
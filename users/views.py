@@ -1,27 +1,40 @@
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
+from django.db import IntegrityError
+from django.views import View
 from .models import User
 from .serializers import UserSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
-from drf_spectacular.utils import extend_schema
+from skillsverse_backend.async_api import error_response, json_response
+from skillsverse_backend.throttling import NonceThrottle
 
-class NonceView(APIView):
-    @extend_schema(
-        parameters=[],
-        responses={
-            200: {'description': 'Current nonce for wallet address'},
-            201: {'description': 'New user created with nonce'}
-        }
-    )
-    def get(self, request, wallet_address):
+class NonceView(View):
+    """
+    Current nonce for a wallet address (200), creating the user on first sight (201)
+    
+    A native async view: it waits on the database without holding a worker thread.
+    Throttled per IP before any query, since every unknown address costs a row.
+    """
+    async def get(self, request, wallet_address):
+        throttle = NonceThrottle()
+        if not await throttle.aallow_request(request, self):
+            throttled = Throttled(throttle.wait())
+            return error_response(
+                str(throttled.detail), throttled.status_code, headers={'Retry-After': str(int(throttled.wait))},
+            )
+        user = await User.objects.filter(wallet_address__iexact=wallet_address).afirst()
+        if user is not None:
+            return json_response({'nonce': user.nonce})
         try:
-            user = User.objects.get(wallet_address__iexact=wallet_address)
-            return Response({'nonce': user.nonce})
-        except User.DoesNotExist:
-            user = User.objects.create_user(wallet_address=wallet_address)
-            return Response({'nonce': user.nonce}, status=status.HTTP_201_CREATED)
+            user = await User.objects.acreate_user(wallet_address=wallet_address)
+        except IntegrityError:
+            # A concurrent request created it first
+            user = await User.objects.aget(wallet_address__iexact=wallet_address)
+            return json_response({'nonce': user.nonce})
+        return json_response({'nonce': user.nonce}, status=status.HTTP_201_CREATED)
 
 
 class WalletSignInView(APIView):